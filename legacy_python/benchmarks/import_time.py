@@ -0,0 +1,69 @@
+"""
+Cold-import budget check, based on `python -X importtime`.
+
+Run from legacy_python/:
+    python benchmarks/import_time.py            # report + check budgets
+    python benchmarks/import_time.py --top 15   # show more of the slowest imports
+
+Each entry module is imported in a fresh interpreter. The check fails (exit 1)
+when its cumulative import time is over budget or when it pulls in a module
+that must stay lazy (MIDI backends, NumPy).
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Entry module -> budget in milliseconds (cumulative, including third-party imports)
+BUDGETS_MS = {
+    "web_app.app": 600,
+    "murrays_cli.main": 120,
+    "murrays_cli.theory_engine": 30,
+}
+
+# Must not be imported just by loading the entry modules
+LAZY_MODULES = ("mido", "rtmidi", "numpy", "msvcrt")
+
+def measure(module):
+    """
+    Returns ([(self_us, cumulative_us, name)] from -X importtime, set of loaded modules).
+    importtime also lists failed optional imports, so "loaded" comes from sys.modules.
+    """
+    code = f"import {module}, sys; print(' '.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows, set(proc.stdout.split())
+
+def check(module, budget_ms, top):
+    rows, loaded = measure(module)
+    total_ms = next(cum for _, cum, name in rows if name == module) / 1000
+    lazy_hits = sorted(name for name in loaded if name.split(".")[0] in LAZY_MODULES)
+
+    status = "OK" if total_ms <= budget_ms and not lazy_hits else "FAIL"
+    print(f"{module:<28} {total_ms:>8.1f} ms  (budget {budget_ms} ms)  {status}")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[0], reverse=True)[:top]:
+        print(f"    {self_us / 1000:>7.1f} ms self  {cumulative_us / 1000:>7.1f} ms cum  {name}")
+    if lazy_hits:
+        print(f"    should be lazy: {', '.join(lazy_hits)}")
+    return status == "OK"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import times against budgets.")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per entry")
+    args = parser.parse_args(argv)
+
+    results = [check(module, budget, args.top) for module, budget in BUDGETS_MS.items()]
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
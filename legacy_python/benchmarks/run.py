@@ -0,0 +1,138 @@
+"""
+Benchmark suite for the theory, rendering and web API hot paths.
+
+Run from legacy_python/:
+    python benchmarks/run.py                                  # print timings
+    python benchmarks/run.py --save benchmarks/baseline.json  # record a baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.15
+
+--compare exits with status 1 when any benchmark is slower than the baseline
+by more than the threshold (0.15 = 15%). --filter runs a subset by name.
+
+benchmarks/baseline.json is the committed reference. Timings depend on the
+machine (its platform is recorded in the file), so re-save it on the machine
+that runs --compare before trusting small differences.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from murrays_cli.theory_engine import TheoryEngine
+from murrays_cli.sheet_music import SheetMusicGenerator
+from murrays_cli.visualizer import PianoVisualizer
+from murrays_cli.voice_leading import VoiceLeading
+from murrays_cli.scale_index import ScaleIndex
+
+SCALE = ["C4", "D4", "E4", "F4", "G4", "A4", "B4", "C5"]
+CHORD = ["G3", "F4", "A4", "B4", "E5"]
+# 32 bars, two chords a bar
+TUNE = ["Cmaj7", "Am7", "Dm7", "G7", "Em7", "A7", "Dm7", "G7", "Fmaj7", "Bbmaj7", "Em7", "A7", "Dm7", "G7", "Cmaj7", "C"] * 4
+
+def theory_benchmarks():
+    ionian = TheoryEngine.MODES['Ionian']
+    return [
+        ("theory.note_to_midi", lambda: TheoryEngine.note_to_midi("Bb3"), 200000),
+        ("theory.get_note_from_interval", lambda: TheoryEngine.get_note_from_interval("C4", 7), 100000),
+        ("theory.generate_scale", lambda: TheoryEngine.generate_scale("D4", ionian), 50000),
+        ("theory.scales_containing", lambda: ScaleIndex.scales_containing(["D4", "F4", "A4", "C5"]), 20000),
+        ("theory.voice_progression_32bars", lambda: VoiceLeading.voice_progression(TUNE), 50),
+    ]
+
+def render_benchmarks():
+    viz = PianoVisualizer()
+    chords = [["C4", "E4", "G4"], ["D4", "F4", "A4"]]
+    state = {"i": 0}
+
+    def viz_render():
+        # Alternate chords so every call has state to patch
+        state["i"] ^= 1
+        viz.set_active_notes(chords[state["i"]])
+        viz.render_lines()
+
+    return [
+        ("render.svg_scale", lambda: SheetMusicGenerator.generate_svg(SCALE), 10000),
+        ("render.svg_chord", lambda: SheetMusicGenerator.generate_svg(CHORD), 10000),
+        ("render.piano_visualizer", viz_render, 50000),
+    ]
+
+def api_benchmarks():
+    from web_app.app import app # Same module the tests and gunicorn load
+    client = app.test_client()
+    return [
+        ("api.analyze", lambda: client.post('/api/analyze', json={"notes": ["E4", "G4", "C5", "Bb4"]}), 2000),
+        ("api.challenge", lambda: client.post('/api/challenge', json={"topic": "Intervals", "challenge_index": 3}), 2000),
+        ("api.curriculum", lambda: client.get('/api/curriculum'), 2000),
+    ]
+
+def collect():
+    return theory_benchmarks() + render_benchmarks() + api_benchmarks()
+
+def run(benchmarks, repeat=5, scale=1.0):
+    """Best-of-`repeat` time per call in microseconds for each benchmark."""
+    results = {}
+    for name, fn, number in benchmarks:
+        number = max(1, int(number * scale))
+        fn() # Warm caches/imports outside the timed runs
+        best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+        results[name] = {"us_per_call": round(best * 1e6, 3), "number": number}
+        print(f"{name:<32} {best * 1e6:>10.2f} us")
+    return results
+
+def compare(results, baseline, threshold):
+    """Prints current vs baseline and returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<32} {'-':>10} {current['us_per_call']:>10.2f} {'new':>8}")
+            continue
+        change = current["us_per_call"] / base["us_per_call"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {base['us_per_call']:>10.2f} {current['us_per_call']:>10.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Murray's benchmark suite")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts (e.g. 0.1 for a quick run)")
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in collect() if args.filter in b[0]]
+    results = run(benchmarks, args.repeat, args.scale)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
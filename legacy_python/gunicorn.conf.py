@@ -0,0 +1,32 @@
+# Gunicorn settings for the web app (picked up automatically from this directory).
+# The app is loaded once in the master so warmed caches are shared by all workers.
+import os
+import tempfile
+
+preload_app = True
+
+# Workers write their metrics here and /metrics adds them up (web_app/metrics.py).
+# Set before the app is loaded; use a separate directory per server on one host.
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "murray-metrics"))
+
+def on_starting(server):
+    from web_app.metrics import metrics
+    metrics.clear() # Numbers from a previous run
+    from web_app.app import warm_challenge_cache
+    count = warm_challenge_cache()
+    server.log.info(f"Challenge cache warmed: {count} entries")
+    # Import NumPy once here instead of in the first /api/audio request of every worker
+    from murrays_cli import audio
+    audio.render(["A4"])
+    # Pitch-class set tables are built on first use; build them before forking
+    from murrays_cli import pc_sets
+    pc_sets.tables()
+
+# /ws/live keeps a connection (and a thread) per student, so use threaded workers.
+# Limit: each open socket holds one of a worker's threads for as long as it is
+# open, so a worker with N threads serves at most N live students and, once
+# they are all connected, no plain HTTP at all. Size GUNICORN_THREADS (per
+# worker) and WEB_CONCURRENCY (workers) for the expected number of live
+# students plus headroom for HTTP (gunicorn reads WEB_CONCURRENCY itself).
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "32"))
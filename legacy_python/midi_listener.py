@@ -1,15 +1,11 @@
 import mido
 import sys
+from murrays_cli.theory_engine import TheoryEngine
 
 # 1. Helper Function: Convert MIDI Number to Note Name
-#    Midi 60 = Middle C (C4)
-NOTES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-
+#    Midi 60 = Middle C (C4). Uses the shared TheoryEngine lookup table.
 def get_note_name(note_number):
-    octave = (note_number // 12) - 1
-    note_index = note_number % 12
-    note_name = NOTES[note_index]
-    return f"{note_name}{octave}"
+    return TheoryEngine.midi_to_note(note_number)
 
 # 2. Function: List Available Ports
 def list_midi_ports():
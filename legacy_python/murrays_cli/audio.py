@@ -0,0 +1,225 @@
+"""
+Renders note lists to 16-bit mono WAV.
+
+Each pitch is synthesized once (additive: a few decaying harmonics) and kept
+in an in-memory cache; a chord or sequence is then just a sum of cached
+arrays at the right offsets. Rendered files can be kept on disk under a
+content hash (AudioCache), so a challenge is only synthesized once.
+
+    python -m murrays_cli.audio C4 E4 G4 --out chord.wav
+    python -m murrays_cli.audio C4 D4 E4 F4 G4 --mode sequence --out scale.wav
+
+NumPy is imported on first render, not at import time.
+"""
+import os
+import sys
+import json
+import struct
+import hashlib
+import argparse
+import tempfile
+import threading
+from functools import lru_cache
+
+from .theory_engine import TheoryEngine
+
+SAMPLE_RATE = 22050
+VERSION = 1 # Bump when the synthesis changes, so disk-cached audio is re-rendered
+
+# Relative amplitude of harmonics 1..n, and how much faster each one decays
+HARMONICS = (1.0, 0.5, 0.3, 0.18, 0.1, 0.06)
+DECAY = 1.8 # 1/seconds for the fundamental
+DECAY_PER_HARMONIC = 0.9
+ATTACK = 0.005 # Seconds; short ramps avoid clicks
+RELEASE = 0.04
+
+NOTE_SECONDS = 0.45 # Sequence step
+SUSTAIN_SECONDS = 0.9 # How long each sequence note rings (overlaps the next)
+CHORD_SECONDS = 1.6
+PEAK = 0.8 # Output peak, as a fraction of full scale
+
+@lru_cache(maxsize=512)
+def pitch_waveform(midi, length, rate=SAMPLE_RATE):
+    """One note, `length` samples, float32 in [-1, 1]. Cached per pitch/length (read-only)."""
+    import numpy as np
+    t = np.arange(length, dtype=np.float32) / rate
+    freq = 440.0 * 2.0 ** ((midi - 69) / 12)
+    k = np.arange(1, len(HARMONICS) + 1, dtype=np.float32)
+    amp = np.asarray(HARMONICS, dtype=np.float32) * (k * freq < rate / 2) # Drop harmonics above Nyquist
+    if not amp.any():
+        wave = np.zeros(length, dtype=np.float32) # Whole note above Nyquist: silence
+        wave.flags.writeable = False
+        return wave
+    # (harmonics, samples) in one broadcast, then summed down to one row
+    partials = np.sin((2 * np.pi * freq) * k[:, None] * t) * np.exp(-(DECAY + DECAY_PER_HARMONIC * (k[:, None] - 1)) * t)
+    wave = amp @ partials / amp.sum()
+
+    ramp = min(int(ATTACK * rate), length)
+    wave[:ramp] *= np.linspace(0, 1, ramp, dtype=np.float32)
+    ramp = min(int(RELEASE * rate), length)
+    wave[length - ramp:] *= np.linspace(1, 0, ramp, dtype=np.float32)
+    wave = wave.astype(np.float32)
+    wave.flags.writeable = False
+    return wave
+
+def default_mode(notes):
+    # Same rule as the sheet music renderer: up to five notes is a chord
+    return "chord" if len(notes) <= 5 else "sequence"
+
+def render(notes, mode=None, rate=SAMPLE_RATE):
+    """
+    notes: note names or MIDI numbers. mode: "chord" (all at once) or
+    "sequence" (one after another); None picks by length.
+    Returns int16 samples (NumPy array).
+    """
+    import numpy as np
+    midis = [n if isinstance(n, int) else TheoryEngine.note_to_midi(n) for n in notes]
+    mode = mode or default_mode(midis)
+    if not midis:
+        return np.zeros(0, dtype=np.int16)
+
+    if mode == "chord":
+        length = int(CHORD_SECONDS * rate)
+        out = np.zeros(length, dtype=np.float32)
+        for m in midis:
+            out += pitch_waveform(m, length, rate)
+    else:
+        step = int(NOTE_SECONDS * rate)
+        length = int(SUSTAIN_SECONDS * rate)
+        out = np.zeros(step * (len(midis) - 1) + length, dtype=np.float32)
+        for i, m in enumerate(midis):
+            out[i * step:i * step + length] += pitch_waveform(m, length, rate)
+
+    peak = float(np.abs(out).max())
+    if peak > 0:
+        out *= PEAK * 32767 / peak
+    return out.astype(np.int16)
+
+def wav_header(sample_count, rate=SAMPLE_RATE):
+    """44-byte RIFF header for mono 16-bit PCM; lets the body be streamed afterwards."""
+    data_bytes = sample_count * 2
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + data_bytes, b"WAVE",
+                       b"fmt ", 16, 1, 1, rate, rate * 2, 2, 16, b"data", data_bytes)
+
+def iter_wav(samples, rate=SAMPLE_RATE, chunk_samples=8192):
+    """Yields the WAV header, then the PCM data in chunks."""
+    yield wav_header(len(samples), rate)
+    data = samples.astype("<i2", copy=False)
+    for start in range(0, len(data), chunk_samples):
+        yield data[start:start + chunk_samples].tobytes()
+
+def to_wav(notes, mode=None, rate=SAMPLE_RATE):
+    """Complete WAV file as bytes."""
+    return b"".join(iter_wav(render(notes, mode, rate), rate))
+
+def write_wav(notes, path, mode=None, rate=SAMPLE_RATE):
+    with open(path, "wb") as f:
+        for chunk in iter_wav(render(notes, mode, rate), rate):
+            f.write(chunk)
+    return path
+
+class AudioCache:
+    """
+    Rendered WAV files on disk, named by the SHA-256 of what was rendered.
+    Writes go to a temp file and are renamed into place, so concurrent
+    workers never see a half-written file. Once the directory grows past
+    max_bytes, the least recently used files (by mtime; hits touch it) are
+    deleted until it is back under PRUNE_TO of the limit.
+    """
+    PRUNE_TO = 0.8
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.approx_bytes = None # This process's running estimate; rescanned on prune
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(notes, mode, rate=SAMPLE_RATE):
+        canonical = json.dumps({"notes": list(notes), "mode": mode, "rate": rate, "version": VERSION},
+                               sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".wav")
+
+    def get(self, key):
+        """Path of the cached file, or None."""
+        path = self.path(key)
+        try:
+            os.utime(path) # Mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, chunks):
+        """Writes an iterable of byte chunks; returns the final path."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self.lock:
+            if self.approx_bytes is None:
+                self.approx_bytes = self.scan()[1]
+            else:
+                self.approx_bytes += size
+            if self.approx_bytes > self.max_bytes:
+                self.prune(keep=path)
+        return path
+
+    def scan(self):
+        """([(mtime, size, path)] for every cached file, total bytes)."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".wav"):
+                    continue
+                full = os.path.join(root, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue # Pruned by another worker meanwhile
+                files.append((st.st_mtime, st.st_size, full))
+        return files, sum(size for _, size, _ in files)
+
+    def prune(self, keep=None):
+        """Deletes least recently used files down to PRUNE_TO * max_bytes."""
+        files, total = self.scan()
+        target = self.max_bytes * self.PRUNE_TO
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                pass # Already gone (another worker pruned it)
+            total -= size
+        self.approx_bytes = total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render notes to a WAV file.")
+    parser.add_argument("notes", nargs="+", help="note names, e.g. C4 E4 G4")
+    parser.add_argument("--mode", choices=("chord", "sequence"), default=None)
+    parser.add_argument("--out", default="notes.wav")
+    args = parser.parse_args(argv)
+
+    unknown = [n for n in args.notes if n not in TheoryEngine.NOTE_TO_MIDI]
+    if unknown:
+        print(f"Unknown notes: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    print(f"Wrote {write_wav(args.notes, args.out, args.mode)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import numpy as np
+from .theory_engine import TheoryEngine
+
+class BatchEngine:
+    """
+    NumPy-backed bulk version of TheoryEngine.generate_scale.
+    Works on MIDI numbers only; names are produced on demand with to_names().
+    """
+    PAD = -1 # Fills the tail of rows for patterns shorter than the widest one
+
+    @staticmethod
+    def get_pattern(key):
+        if key in TheoryEngine.MODES:
+            return TheoryEngine.MODES[key]
+        if key in TheoryEngine.TRIAD_FORMULAS:
+            return TheoryEngine.TRIAD_FORMULAS[key]
+        raise KeyError(f"Unknown scale/chord key: {key}")
+
+    @staticmethod
+    def pattern_matrix(keys):
+        """
+        Stacks patterns into a (len(keys), width) offset array plus their lengths.
+        keys: MODES / TRIAD_FORMULAS keys e.g. ["Ionian", "maj7"]
+        """
+        patterns = [BatchEngine.get_pattern(k) for k in keys]
+        lengths = np.array([len(p) for p in patterns], dtype=np.int16)
+        width = int(lengths.max()) if len(patterns) else 0
+        offsets = np.zeros((len(patterns), width), dtype=np.int16)
+        for i, pattern in enumerate(patterns):
+            offsets[i, :len(pattern)] = pattern
+        return offsets, lengths
+
+    @staticmethod
+    def root_array(roots):
+        """
+        Accepts MIDI ints and/or note names ("C4", "Bb3") and returns an int array.
+        Raises ValueError for unknown names and anything outside MIDI 0-127.
+        """
+        midi = []
+        for r in roots:
+            if isinstance(r, str):
+                m = TheoryEngine.NOTE_TO_MIDI.get(r)
+            else:
+                m = int(r) if isinstance(r, (int, np.integer)) and not isinstance(r, bool) else None
+            if m is None or not 0 <= m < 128:
+                raise ValueError(f"Invalid root: {r!r}")
+            midi.append(m)
+        return np.asarray(midi, dtype=np.int16)
+
+    @staticmethod
+    def generate(roots, keys):
+        """
+        Every pattern in keys on every root, in one broadcast.
+        Returns (midi, lengths):
+          midi    -> int array (len(roots) * len(keys), width), row = root_idx * len(keys) + key_idx
+          lengths -> number of valid columns per row, the rest is PAD
+        """
+        root_midi = BatchEngine.root_array(roots)
+        offsets, pattern_lengths = BatchEngine.pattern_matrix(keys)
+
+        midi = root_midi[:, None, None] + offsets[None, :, :]
+        valid = np.arange(offsets.shape[1])[None, None, :] < pattern_lengths[None, :, None]
+        midi = np.where(valid, midi, BatchEngine.PAD)
+
+        rows = len(root_midi) * len(keys)
+        return midi.reshape(rows, offsets.shape[1]), np.tile(pattern_lengths, len(root_midi))
+
+    @staticmethod
+    def all_keys(keys, octaves=range(1, 9)):
+        """Shortcut for the content QA run: all 12 pitch classes in every octave."""
+        roots = [(octave + 1) * 12 + pc for octave in octaves for pc in range(12)]
+        return BatchEngine.generate(roots, keys)
+
+    @staticmethod
+    def to_names(midi, lengths=None, spelling="sharp"):
+        """Converts a generate() result back to lists of note names."""
+        midi = np.asarray(midi)
+        if midi.ndim == 1:
+            midi = midi[None, :]
+        if lengths is None:
+            lengths = (midi != BatchEngine.PAD).sum(axis=1)
+
+        in_range = (midi >= 0) & (midi < 128)
+        table = np.asarray(TheoryEngine.MIDI_TO_NOTE[spelling], dtype=object)
+        names = table[np.where(in_range, midi, 0)]
+
+        result = []
+        for row, row_names, row_ok, n in zip(midi, names, in_range, lengths):
+            result.append([name if ok else TheoryEngine.midi_to_note(int(m), spelling)
+                           for m, name, ok in zip(row[:n], row_names[:n], row_ok[:n])])
+        return result
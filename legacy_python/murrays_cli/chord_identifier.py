@@ -0,0 +1,108 @@
+from .theory_engine import TheoryEngine
+
+class ChordIdentifier:
+    """
+    Names chords from a 4096-entry table indexed by 12-bit pitch-class bitmask
+    (bit 0 = C, bit 11 = B). Every transposition of every formula is stored
+    once, so a lookup is one OR-loop over the notes plus a list index.
+    """
+
+    # Extensions on top of TheoryEngine.TRIAD_FORMULAS, in chord-tone order (root,
+    # 3rd, 5th, 7th, then tensions) so a tone's index is the inversion it makes
+    # in the bass. Tensions are written above the octave (9th = 14).
+    EXTENDED_FORMULAS = {
+        'minmaj7': [0, 3, 7, 11],
+        'aug7':   [0, 4, 8, 10],
+        '7sus4':  [0, 5, 7, 10],
+        'add9':   [0, 4, 7, 14],
+        'madd9':  [0, 3, 7, 14],
+        'dom9':   [0, 4, 7, 10, 14],
+        'maj9':   [0, 4, 7, 11, 14],
+        'min9':   [0, 3, 7, 10, 14],
+        'dom7b9': [0, 4, 7, 10, 13],
+        '6/9':    [0, 4, 7, 9, 14],
+    }
+
+    # Display suffix per formula key ("C" + "m7" -> "Cm7")
+    SUFFIXES = {
+        'maj': '', 'min': 'm', 'dim': 'dim', 'aug': 'aug', 'sus4': 'sus4', 'sus2': 'sus2',
+        'maj7': 'maj7', 'min7': 'm7', 'dom7': '7', 'm7b5': 'm7b5', 'dim7': 'dim7',
+        'maj6': '6', 'min6': 'm6', 'minmaj7': 'm(maj7)', 'aug7': 'aug7', '7sus4': '7sus4',
+        'add9': 'add9', 'madd9': 'madd9', 'dom9': '9', 'maj9': 'maj9', 'min9': 'm9',
+        'dom7b9': '7b9', '6/9': '6/9',
+    }
+
+    INVERSIONS = ["root position", "1st inversion", "2nd inversion", "3rd inversion", "4th inversion"]
+
+    @staticmethod
+    def _build_table():
+        # table[mask] -> tuple of (root_pc, formula_key, pcs in chord-tone order)
+        # Insertion order is the ranking: basic triads/7ths first, then extensions.
+        table = [[] for _ in range(4096)]
+        formulas = dict(TheoryEngine.TRIAD_FORMULAS)
+        formulas.update(ChordIdentifier.EXTENDED_FORMULAS)
+        for key, formula in formulas.items():
+            for root_pc in range(12):
+                pcs = tuple((root_pc + s) % 12 for s in formula)
+                mask = 0
+                for pc in pcs:
+                    mask |= 1 << pc
+                table[mask].append((root_pc, key, pcs))
+        return tuple(tuple(entry) for entry in table)
+
+    @staticmethod
+    def pitch_class_mask(midi_notes):
+        mask = 0
+        for m in midi_notes:
+            mask |= 1 << (m % 12)
+        return mask
+
+    @staticmethod
+    def spelling_of(note_name):
+        """"flat" for names written with a flat (Bb3, Ebb4), else "sharp"."""
+        return "flat" if "b" in note_name[1:] else "sharp"
+
+    @staticmethod
+    def chord_name(root_pc, formula_key, bass_pc=None, spelling="sharp"):
+        """spelling: "sharp" (A#, C#/G#) or "flat" (Bb, Db/Ab) for the root and bass."""
+        names = TheoryEngine.FLAT_NOTES if spelling == "flat" else TheoryEngine.NOTES
+        name = names[root_pc] + ChordIdentifier.SUFFIXES.get(formula_key, formula_key)
+        if bass_pc is not None and bass_pc != root_pc:
+            name += "/" + names[bass_pc]
+        return name
+
+    @staticmethod
+    def identify(midi_notes, spelling="sharp"):
+        """
+        midi_notes: iterable of MIDI numbers (any order, duplicates/octaves allowed).
+        spelling: how chord names spell black keys ("sharp" or "flat").
+        Returns None when the pitch-class set is not a known chord, otherwise a dict
+        with chord, root_pc, formula_key, inversion and alternatives.
+        """
+        if not midi_notes:
+            return None
+        candidates = ChordIdentifier.TABLE[ChordIdentifier.pitch_class_mask(midi_notes)]
+        if not candidates:
+            return None
+
+        bass_pc = min(midi_notes) % 12
+
+        # Prefer the reading whose root is in the bass; otherwise the table order
+        best = candidates[0]
+        for cand in candidates:
+            if cand[0] == bass_pc:
+                best = cand
+                break
+
+        root_pc, key, pcs = best
+        inversion = pcs.index(bass_pc)
+        return {
+            "chord": ChordIdentifier.chord_name(root_pc, key, bass_pc, spelling),
+            "root_pc": root_pc,
+            "formula_key": key,
+            "inversion": ChordIdentifier.INVERSIONS[inversion],
+            "alternatives": [ChordIdentifier.chord_name(r, k, bass_pc, spelling)
+                             for r, k, _ in candidates if (r, k) != (root_pc, key)],
+        }
+
+ChordIdentifier.TABLE = ChordIdentifier._build_table()
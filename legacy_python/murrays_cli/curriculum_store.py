@@ -0,0 +1,161 @@
+"""
+Indexed, lazily loaded challenge data.
+
+The editable source is data/challenges.json ({topic: [challenge, ...]}).
+Compiling validates it and writes:
+  data/challenges.jsonl       one challenge per line, grouped by topic
+  data/challenges.index.json  {topic: [byte_offset, byte_length, count]}
+
+    python -m murrays_cli.curriculum_store            # validate + compile
+    python -m murrays_cli.curriculum_store --check    # validate only
+
+At runtime only the index is read; a topic's lines are read (one seek + read)
+the first time it is accessed and then kept.
+"""
+import os
+import sys
+import json
+import argparse
+import threading
+from collections.abc import Mapping
+
+from .theory_engine import TheoryEngine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOURCE_FILE = os.path.join(DATA_DIR, "challenges.json")
+DATA_FILE = os.path.join(DATA_DIR, "challenges.jsonl")
+INDEX_FILE = os.path.join(DATA_DIR, "challenges.index.json")
+
+# Required keys per challenge type (besides "type" and "instruction")
+REQUIRED_KEYS = {
+    "triad": ("root", "formula_key"),
+    "interval": ("root", "semitones"),
+    "sequence": ("notes",),
+}
+
+class ChallengeStore(Mapping):
+    """Read-only {topic: [challenge, ...]} backed by the compiled data file."""
+    def __init__(self, data_file=DATA_FILE, index_file=INDEX_FILE):
+        self.data_file = data_file
+        self.index_file = index_file
+        self._index = None
+        self._topics = {}
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        if self._index is None:
+            with open(self.index_file, encoding="utf-8") as f:
+                self._index = json.load(f)
+        return self._index
+
+    def __getitem__(self, topic):
+        challenges = self._topics.get(topic)
+        if challenges is None:
+            offset, length, _ = self.index[topic] # KeyError for unknown topics
+            with self._lock:
+                challenges = self._topics.get(topic)
+                if challenges is None:
+                    with open(self.data_file, "rb") as f:
+                        f.seek(offset)
+                        raw = f.read(length)
+                    challenges = [json.loads(line) for line in raw.decode("utf-8").splitlines()]
+                    self._topics[topic] = challenges
+        return challenges
+
+    def __contains__(self, topic):
+        return topic in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def count(self, topic):
+        """Number of challenges in a topic without loading it."""
+        entry = self.index.get(topic)
+        return entry[2] if entry else 0
+
+    def loaded_topics(self):
+        return list(self._topics)
+
+def validate_challenge(challenge):
+    """Returns a list of problems with one challenge (empty if fine)."""
+    problems = []
+    kind = challenge.get("type")
+    if kind not in REQUIRED_KEYS:
+        return [f"unknown type {kind!r}"]
+    for key in ("instruction",) + REQUIRED_KEYS[kind]:
+        if key not in challenge:
+            problems.append(f"missing {key!r}")
+
+    notes = list(challenge.get("notes", []))
+    if "root" in challenge:
+        notes.append(challenge["root"])
+    for note in notes:
+        if note not in TheoryEngine.NOTE_TO_MIDI:
+            problems.append(f"unknown note {note!r}")
+
+    if kind == "triad" and challenge.get("formula_key") not in TheoryEngine.TRIAD_FORMULAS:
+        problems.append(f"unknown formula_key {challenge.get('formula_key')!r}")
+    if kind == "interval" and not isinstance(challenge.get("semitones"), int):
+        problems.append("semitones must be an int")
+    if kind == "sequence" and not challenge.get("notes"):
+        problems.append("empty notes")
+    if "voicing" in challenge and (kind != "sequence" or not isinstance(challenge["voicing"], bool)):
+        problems.append("voicing must be true/false on a sequence")
+    return problems
+
+def validate(source, known_topics=None):
+    """Validates a {topic: [challenge]} dict; returns 'topic[i]: problem' strings."""
+    errors = []
+    for topic, challenges in source.items():
+        if known_topics is not None and topic not in known_topics:
+            errors.append(f"{topic}: not in any curriculum path")
+        for i, challenge in enumerate(challenges):
+            errors.extend(f"{topic}[{i}]: {p}" for p in validate_challenge(challenge))
+    return errors
+
+def compile_store(source, data_file=DATA_FILE, index_file=INDEX_FILE):
+    """Writes the data file and its topic offset index. Returns the index."""
+    index = {}
+    offset = 0
+    with open(data_file, "wb") as out:
+        for topic, challenges in source.items():
+            block = "".join(json.dumps(c, ensure_ascii=False, separators=(",", ":")) + "\n" for c in challenges).encode("utf-8")
+            out.write(block)
+            index[topic] = [offset, len(block), len(challenges)]
+            offset += len(block)
+    with open(index_file, "w", encoding="utf-8") as f:
+        # One topic per line keeps diffs of the index readable
+        f.write("{\n" + ",\n".join(f" {json.dumps(t, ensure_ascii=False)}: {json.dumps(v)}" for t, v in index.items()) + "\n}\n")
+    return index
+
+def main(argv=None):
+    from .curriculum import Curriculum
+
+    parser = argparse.ArgumentParser(description="Validate and compile the challenge data file.")
+    parser.add_argument("--source", default=SOURCE_FILE)
+    parser.add_argument("--check", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args(argv)
+
+    with open(args.source, encoding="utf-8") as f:
+        source = json.load(f)
+    errors = validate(source, set(Curriculum.BEGINNER_PATH) | set(Curriculum.ADVANCED_PATH))
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} problem(s); nothing written.", file=sys.stderr)
+        return 1
+
+    total = sum(len(c) for c in source.values())
+    if not args.check:
+        compile_store(source)
+        print(f"Compiled {total} challenges in {len(source)} topics -> {DATA_FILE}")
+    else:
+        print(f"OK: {total} challenges in {len(source)} topics")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
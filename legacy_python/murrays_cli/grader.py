@@ -0,0 +1,119 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from .theory_engine import TheoryEngine
+
+# ordered: grade `sequence` note by note (exact MIDI), else grade `mask` as a held chord.
+# bass_pc: pitch class that must be lowest for voiced chords (inversions), or None.
+# notes: MIDI bitmask the held notes must equal when the target repeats a pitch
+# class (an octave can't be told from one note by pitch class), else 0.
+CompiledTarget = namedtuple("CompiledTarget", ["ordered", "mask", "bass_pc", "sequence", "total", "notes"])
+
+# Result of one event. error: name of the first wrong note since the last reset (or None).
+Grade = namedtuple("Grade", ["progress", "total", "complete", "error", "wrong"])
+
+class DrillGrader:
+    """
+    Compiles challenges into grading targets. Targets are cached, so a challenge
+    is only compiled the first time it is graded.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def compile(target_notes, ordered=False, voiced=False):
+        """
+        target_notes: tuple of note names or MIDI numbers.
+        voiced: chords must also have the target's lowest pitch class in the bass.
+        """
+        midi = tuple(n if isinstance(n, int) else TheoryEngine.note_to_midi(n) for n in target_notes)
+        if ordered:
+            return CompiledTarget(True, 0, None, midi, len(midi), 0)
+        mask = notes = 0
+        for m in midi:
+            mask |= 1 << (m % 12)
+            notes |= 1 << m
+        bass_pc = min(midi) % 12 if voiced and midi else None
+        if bin(mask).count("1") < len(set(midi)):
+            # Repeated pitch class (e.g. an octave): grade the exact keys
+            return CompiledTarget(False, mask, None, midi, bin(notes).count("1"), notes)
+        return CompiledTarget(False, mask, bass_pc, midi, bin(mask).count("1"), 0)
+
+    @staticmethod
+    def is_ordered(challenge):
+        # "sequence" challenges flagged "voicing" in the data are chords, not melodies
+        return challenge.get("type") == "sequence" and not challenge.get("voicing")
+
+    @staticmethod
+    def compile_challenge(challenge, target_notes):
+        """Target for a Curriculum.CHALLENGES entry whose notes are already resolved."""
+        ordered = DrillGrader.is_ordered(challenge)
+        # Written voicings (inversions, jazz shapes) are graded with their bass note
+        voiced = not ordered and challenge.get("type") == "sequence"
+        return DrillGrader.compile(tuple(target_notes), ordered, voiced)
+
+class GradeSession:
+    """
+    Incremental grading of one target. event() updates a handful of integers
+    per note, so grading cost does not grow with the size of the chord/scale.
+    """
+    def __init__(self, target):
+        self.target = target
+        self.reset()
+
+    def reset(self):
+        self.held = 0 # Bitmask over MIDI numbers currently down
+        self.pc_counts = [0] * 12 # Held notes per pitch class (octave doublings)
+        self.pc_mask = 0
+        self.progress = 0
+        self.error = None
+
+    def event(self, kind, midi):
+        """kind: "on" | "off". Returns a Grade."""
+        bit = 1 << midi
+        if kind == "on":
+            if self.held & bit:
+                return self.grade(None)
+            self.held |= bit
+            pc = midi % 12
+            self.pc_counts[pc] += 1
+            self.pc_mask |= 1 << pc
+        else:
+            if not self.held & bit:
+                return self.grade(None)
+            self.held &= ~bit
+            pc = midi % 12
+            self.pc_counts[pc] -= 1
+            if not self.pc_counts[pc]:
+                self.pc_mask &= ~(1 << pc)
+            return self.grade(None)
+
+        t = self.target
+        wrong = None
+        if t.ordered:
+            # Advance on the expected note; wrong notes are reported, not penalised
+            if self.progress < t.total:
+                if midi == t.sequence[self.progress]:
+                    self.progress += 1
+                else:
+                    wrong = midi
+        elif not (t.notes >> midi if t.notes else t.mask >> pc) & 1:
+            wrong = midi
+        if wrong is not None and self.error is None:
+            self.error = TheoryEngine.midi_to_note(wrong)
+        return self.grade(wrong)
+
+    def grade(self, wrong=None):
+        t = self.target
+        if t.ordered:
+            complete = self.progress == t.total
+        elif t.notes:
+            self.progress = bin(self.held & t.notes).count("1")
+            complete = self.held == t.notes
+        else:
+            self.progress = bin(self.pc_mask & t.mask).count("1")
+            complete = self.pc_mask == t.mask and self.held != 0
+            if complete and t.bass_pc is not None:
+                lowest = (self.held & -self.held).bit_length() - 1
+                complete = lowest % 12 == t.bass_pc
+        return Grade(self.progress, t.total, complete, self.error,
+                     None if wrong is None else TheoryEngine.midi_to_note(wrong))
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+from .theory_engine import TheoryEngine
+
+# Krumhansl-Kessler probe-tone profiles, tonic first
+MAJOR_PROFILE = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+MINOR_PROFILE = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+
+# Row order of the 24 keys: C..B major, then C..B minor
+KEYS = tuple((pc, "major") for pc in range(12)) + tuple((pc, "minor") for pc in range(12))
+
+# tonic_pc, mode ("major"/"minor"), name ("A minor"), correlation (-1..1), and the runner-up name
+KeyEstimate = namedtuple("KeyEstimate", ["tonic_pc", "mode", "name", "correlation", "runner_up"])
+
+_PROFILES = None
+
+def profile_matrix():
+    """24x12 matrix of z-scored key profiles, built (and NumPy imported) on first use."""
+    global _PROFILES
+    if _PROFILES is None:
+        import numpy as np
+        rows = [np.roll(MAJOR_PROFILE, pc) for pc in range(12)] + [np.roll(MINOR_PROFILE, pc) for pc in range(12)]
+        m = np.array(rows, dtype=np.float64)
+        m -= m.mean(axis=1, keepdims=True)
+        m /= m.std(axis=1, keepdims=True)
+        _PROFILES = m / 12 # So that profiles @ zscore(h) is the Pearson correlation
+    return _PROFILES
+
+def key_spelling(tonic_pc, mode):
+    """"flat" for keys written with flats (F major, D minor, ...), else "sharp"."""
+    # Relative major tonic; flat keys sit anticlockwise of C on the circle of 5ths
+    major_pc = tonic_pc if mode == "major" else (tonic_pc + 3) % 12
+    return "flat" if major_pc in (5, 10, 3, 8, 1) else "sharp"
+
+def key_name(tonic_pc, mode, spelling=None):
+    """spelling=None spells the tonic the way the key signature would."""
+    spelling = spelling or key_spelling(tonic_pc, mode)
+    names = TheoryEngine.FLAT_NOTES if spelling == "flat" else TheoryEngine.NOTES
+    return f"{names[tonic_pc]} {mode}"
+
+class KeyDetector:
+    """
+    Running key estimate from note events (Krumhansl-Schmuckler).
+
+    Every note-on adds its weight to a 12-bin pitch-class histogram whose
+    contents decay with the given half-life (seconds of event time), so only
+    recent playing counts. Decay is applied lazily: new weights are scaled up
+    by 2**(t / half_life) instead of shrinking all 12 bins, which keeps an
+    update to one addition. half_life=None never forgets (whole-piece key).
+    estimate() correlates the histogram against all 24 keys in one matrix product.
+    """
+    RESCALE_AFTER = 64 # Half-lives before the growing scale is folded back into the bins
+
+    def __init__(self, half_life=8.0, min_notes=3, spelling=None):
+        self.half_life = half_life
+        self.min_notes = min_notes
+        self.spelling = spelling
+        self.reset()
+
+    def reset(self):
+        self.histogram = [0.0] * 12
+        self.origin = None # Event time the scale is measured from
+        self.scale = 1.0
+        self.count = 0
+
+    def _weight_scale(self, t):
+        if self.half_life is None:
+            return 1.0
+        if self.origin is None:
+            self.origin = t
+        exponent = (t - self.origin) / self.half_life
+        if exponent > self.RESCALE_AFTER:
+            # Fold the decay into the bins (long gaps just underflow to 0)
+            self.histogram = [h * 2.0 ** -min(exponent, 1024) for h in self.histogram]
+            self.origin = t
+            exponent = 0.0
+        self.scale = 2.0 ** exponent
+        return self.scale
+
+    def note_on(self, note, t, weight=1.0):
+        """note: MIDI number; t: seconds (monotonic or file time)."""
+        scale = self._weight_scale(t) # May renormalize the bins, so before indexing
+        self.histogram[note % 12] += weight * scale
+        self.count += 1
+
+    def feed(self, event):
+        """Takes a MidiManager MidiEvent; only note-ons carry key information."""
+        if event.kind == "on":
+            self.note_on(event.note, event.timestamp)
+
+    def scores(self):
+        """Correlation with each of the 24 KEYS (NumPy array), or None if too little played."""
+        if self.count < self.min_notes:
+            return None
+        import numpy as np
+        h = np.asarray(self.histogram, dtype=np.float64)
+        std = h.std()
+        if std == 0:
+            return None # All pitch classes equally weighted: no key
+        return profile_matrix() @ ((h - h.mean()) / std)
+
+    def estimate(self):
+        """Best KeyEstimate, or None."""
+        scores = self.scores()
+        if scores is None:
+            return None
+        best, second = scores.argsort()[-1:-3:-1]
+        tonic_pc, mode = KEYS[best]
+        return KeyEstimate(tonic_pc, mode, key_name(tonic_pc, mode, self.spelling),
+                           round(float(scores[best]), 3), key_name(*KEYS[second], self.spelling))
+
+    def weights(self):
+        """Current (decayed) histogram, most recent event = scale 1."""
+        return [h / self.scale for h in self.histogram]
+
+def estimate_key(midi_notes, spelling=None):
+    """Key of a plain collection of MIDI note numbers (no decay)."""
+    detector = KeyDetector(half_life=None, min_notes=1, spelling=spelling)
+    for note in midi_notes:
+        detector.note_on(note, 0.0)
+    return detector.estimate()
@@ -1,110 +1,147 @@
-import sys
-import os
 import time
-import random
-import msvcrt
-from .theory_engine import TheoryEngine, VoicingLogic, Calculators
+import getpass
+import threading
+from .theory_engine import TheoryEngine
 from .curriculum import Curriculum
 from .visualizer import PianoVisualizer
 from .midi_manager import MidiManager
-from .sheet_music import SheetMusicGenerator
+from .terminal import TerminalRenderer
+from .progress_store import ProgressStore
+from .grader import DrillGrader, GradeSession
+from .key_detection import KeyDetector
 
 class MurraysCLI:
-    def __init__(self):
+    def __init__(self, fps=30, progress=None, student=None):
         self.viz = PianoVisualizer()
-        self.midi = MidiManager(callback=self.on_midi_event)
+        # One redraw per ~frame: a chord arrives as a single snapshot, not N partial ones
+        self.midi = MidiManager(snapshot_callback=self.on_midi_event, coalesce_window=1 / 60)
         self.current_notes = [] # Names
         self.running = True
         self.mode = "MENU" # MENU, TOPIC, DRILL, FREE
         self.current_topic = None
         self.feedback_msg = ""
-        
+        self.screen = TerminalRenderer(fps=fps)
+        self.frame = []
+        self.frame_lock = threading.Lock()
+        # Drill results go to the same progress store the web app uses
+        self.progress = progress if progress is not None else ProgressStore()
+        self.student = student or getpass.getuser()
+        self.drill_index = 0
+        self.drill_started = 0.0
+        self.drill_passed = False
+        self.drill_grader = None # GradeSession for the current drill
+        self.drill_grade = None
+        self.active_midi = ()
+        self.key = KeyDetector(half_life=8.0) # Key of roughly the last few bars
+
     def clear(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Next frame starts from a blank screen
+        self.screen.invalidate()
 
-    def on_midi_event(self, notes):
-        self.current_notes = notes
-        self.viz.set_active_notes(notes)
+    def on_midi_event(self, snapshot):
+        # snapshot.active is MIDI numbers; the visualizer takes them as-is
+        self.viz.set_active_notes(snapshot.active)
+        self.current_notes = [TheoryEngine.midi_to_note(n) for n in snapshot.active]
+        self.active_midi = snapshot.active
+        for event in snapshot.deltas:
+            self.key.feed(event)
+        grader = self.drill_grader
+        if grader is not None:
+            for event in snapshot.deltas:
+                self.drill_grade = grader.event(event.kind, event.note)
+            if self.drill_grade.complete and not self.drill_passed:
+                self.drill_passed = True
+                self.record_drill(True)
         if self.mode in ["FREE", "DRILL", "TOPIC"]:
             self.refresh_screen()
 
+    def emit(self, text=""):
+        # Adds text to the frame refresh_screen is building
+        self.frame.extend(text.split("\n"))
+
     def refresh_screen(self):
-        self.clear()
-        print("MURRAY'S MUSIC THEORY v2.0")
-        print("==========================")
+        # Called from both the input loop and the MIDI thread
+        with self.frame_lock:
+            self.frame = []
+            self.build_screen()
+            self.screen.draw(self.frame)
+
+    def build_screen(self):
+        self.emit("MURRAY'S MUSIC THEORY v2.0")
+        self.emit("==========================")
         
         if self.mode == "MENU":
             self.print_menu()
         elif self.mode == "TOPIC":
             self.print_topic()
         elif self.mode == "FREE":
-            print("\n[FREE PLAY MODE]")
-            print("Play your MIDI keyboard. Press 'Q' to quit.")
-            print("-" * 40)
-            self.viz.render()
-            print(f"\nDetected: {', '.join(self.current_notes)}")
+            self.emit("\n[FREE PLAY MODE]")
+            self.emit("Play your MIDI keyboard. Press 'Q' to quit.")
+            self.emit("-" * 40)
+            self.frame.extend(self.viz.render_lines())
+            self.emit(f"\nDetected: {', '.join(self.current_notes)}")
+            key = self.key.estimate()
+            self.emit(f"Key:      {key.name} (r={key.correlation:.2f})" if key else "Key:      -")
             
             # Analyze Chord
             if len(self.current_notes) >= 3:
                 # Basic analysis (naive)
                 root = self.current_notes[0] # Naive assumption: Lowest note is root
-                print(f"Potential Root: {root}")
+                self.emit(f"Potential Root: {root}")
                 
         elif self.mode == "DRILL":
             self.print_drill()
 
         if self.feedback_msg:
-            print(f"\n>> {self.feedback_msg}")
+            self.emit(f"\n>> {self.feedback_msg}")
 
     def print_menu(self):
-        print("\nSelect a Path:")
-        print("1. Beginner Course")
-        print("2. Advanced Course")
-        print("3. Free Play (MIDI Test)")
-        print("Q. Quit")
+        self.emit("\nSelect a Path:")
+        self.emit("1. Beginner Course")
+        self.emit("2. Advanced Course")
+        self.emit("3. Free Play (MIDI Test)")
+        self.emit("Q. Quit")
 
     def print_topic(self):
-        print(f"\nTOPIC: {self.current_topic}")
+        self.emit(f"\nTOPIC: {self.current_topic}")
         desc = Curriculum.DESCRIPTIONS.get(self.current_topic, "No description.")
-        print(f"Info: {desc}")
-        print("\nControls:")
-        print("[D] Enter Drill Mode")
-        print("[G] Generate Sheet Music")
-        print("[B] Back to Menu")
+        self.emit(f"Info: {desc}")
+        self.emit("\nControls:")
+        self.emit("[D] Enter Drill Mode")
+        self.emit("[G] Generate Sheet Music")
+        self.emit("[B] Back to Menu")
         
-        print("\nVisual Reference:")
-        self.viz.render()
-        print(f"\nActive Notes: {self.current_notes}")
+        self.emit("\nVisual Reference:")
+        self.frame.extend(self.viz.render_lines())
+        self.emit(f"\nActive Notes: {self.current_notes}")
 
     def print_drill(self):
-        print(f"\nDRILL: {self.current_topic}")
-        print(f"Task: {self.drill_target_desc}")
-        
-        # Check correctness
-        # Logic: Convert target notes to set, compare with current input
-        target_set = set(self.drill_target_notes)
-        current_set = set(self.current_notes)
+        self.emit(f"\nDRILL: {self.current_topic}")
+        self.emit(f"Task: {self.drill_target_desc}")
         
-        # Determine if correct (ignoring octaves for basic theory check? Or specific?)
-        # Let's require specific notes for now, or just note names.
+        grade = self.drill_grade
+        self.emit(f"Target Notes: {', '.join(self.drill_target_notes)}")
+        self.emit(f"Your Input:   {', '.join(sorted({n[:-1] for n in self.current_notes}))}")
+        if grade is not None:
+            self.emit(f"Progress:     {grade.progress}/{grade.total}")
+            if grade.error:
+                self.emit(f"First miss:   {grade.error}")
         
-        def strip_octave(n): return n[:-1]
-        target_names = {strip_octave(n) for n in target_set}
-        current_names = {strip_octave(n) for n in current_set}
+        self.frame.extend(self.viz.render_lines())
         
-        print(f"Target Notes: {', '.join(sorted(list(target_names)))}")
-        print(f"Your Input:   {', '.join(sorted(list(current_names)))}")
-        
-        self.viz.render()
-        
-        if target_names == current_names and len(current_names) > 0:
-            print("\n[SUCCESS!] Great job.")
-            print("Press [N] for Next Challenge or [B] for Back.")
+        if grade is None:
+            self.emit("\nNo more challenges in this topic.")
+            self.emit("[B] Back")
+        elif self.drill_passed:
+            self.emit("\n[SUCCESS!] Great job.")
+            self.emit("Press [N] for Next Challenge or [B] for Back.")
         else:
-            print("\n... Waiting for correct notes ...")
-            print("[N] Skip/Next  [B] Back")
+            self.emit("\n... Waiting for correct notes ...")
+            self.emit("[N] Skip/Next  [B] Back")
 
     def run(self):
+        import msvcrt # Windows console input; only needed once the UI runs
+
         # Start MIDI in background
         self.midi.start()
         
@@ -128,7 +165,7 @@ class MurraysCLI:
                      if msvcrt.kbhit():
                         key = msvcrt.getch().decode('utf-8').lower()
                         if key == 'b': self.mode = "TOPIC"
-                        if key == 'n': self.setup_drill()
+                        if key == 'n': self.next_drill()
 
                 elif self.mode == "TOPIC":
                     # We want to see MIDI input here too
@@ -137,10 +174,12 @@ class MurraysCLI:
                         key = msvcrt.getch().decode('utf-8').lower()
                         if key == 'b': self.mode = "MENU"
                         if key == 'd': 
+                            self.drill_index = self.progress.next_challenge(self.student, self.current_topic)
                             self.setup_drill()
                             self.mode = "DRILL"
                         if key == 'g':
                             # Generate Sheet Music
+                            from .sheet_music import SheetMusicGenerator
                             fname = SheetMusicGenerator.generate_svg(self.current_notes if self.current_notes else ["C4", "E4", "G4"])
                             self.feedback_msg = f"Generated {fname}"
 
@@ -160,14 +199,17 @@ class MurraysCLI:
             pass
         finally:
             self.midi.stop()
+            self.screen.close()
+            self.progress.close()
             print("\nGoodbye!")
 
     def select_course(self, path):
-        self.clear()
-        print("\nSelect Topic:")
+        import msvcrt
+        lines = ["", "Select Topic:"]
         for i, topic in enumerate(path):
-            print(f"{i+1}. {topic}")
-        print("B. Back")
+            lines.append(f"{i+1}. {topic}")
+        lines.append("B. Back")
+        self.screen.draw(lines)
         
         while True:
             if msvcrt.kbhit():
@@ -182,33 +224,41 @@ class MurraysCLI:
                 except:
                     pass
 
+    def record_drill(self, correct):
+        duration_ms = int((time.time() - self.drill_started) * 1000)
+        self.progress.record_attempt(self.student, self.current_topic, self.drill_index, correct, duration_ms)
+
+    def next_drill(self):
+        if self.drill_grader is None:
+            return # Past the last challenge
+        # Skipping an unsolved drill counts as a miss
+        if not self.drill_passed:
+            self.record_drill(False)
+        self.drill_index += 1
+        self.setup_drill()
+
     def setup_drill(self):
-        # Generate a random challenge based on topic
-        root = random.choice(["C", "G", "D", "A", "F", "Bb"]) + "4"
-        self.drill_target_desc = f"Play a {self.current_topic} in {root}"
-        
-        # Logic to get notes
-        # Simplify: Just mapping string to formula lookup?
-        # Ideally we map "Major Triads" -> 'maj' key in TheoryEngine
-        
-        key_map = {
-            "Major Triads": 'maj',
-            "Minor Triads": 'min',
-            "Diminished Triads": 'dim',
-            "Major 7th Chords": 'maj7',
-            "Minor 7th Chords": 'min7',
-            "Dominant 7th Chords": 'dom7',
-            "Half-Diminished 7th": 'm7b5',
-            "Fully Diminished 7th": 'dim7'
-        }
-        
-        formula_key = key_map.get(self.current_topic)
-        if formula_key:
-            pat = TheoryEngine.TRIAD_FORMULAS.get(formula_key)
-            self.drill_target_notes = TheoryEngine.generate_scale(root, pat)
-        else:
-            self.drill_target_notes = [root] # Fallback
-            
+        # Drill = curriculum challenge drill_index of the topic, graded like the web app
+        self.drill_started = time.time()
+        self.drill_passed = False
+        self.drill_grader = None
+        self.drill_grade = None
+        self.drill_target_notes = []
+
+        challenges = Curriculum.CHALLENGES.get(self.current_topic) or []
+        if self.drill_index >= len(challenges):
+            self.drill_target_desc = "You've completed all challenges for this section!"
+            return
+        challenge = challenges[self.drill_index]
+        self.drill_target_desc = f"{challenge['instruction']} ({self.drill_index + 1}/{len(challenges)})"
+        self.drill_target_notes = Curriculum.resolve_target_notes(challenge)
+
+        target = DrillGrader.compile_challenge(challenge, self.drill_target_notes)
+        grader = GradeSession(target)
+        # Notes still held from the last drill don't count; only new presses do
+        self.drill_grade = grader.grade()
+        self.drill_grader = grader
+
 if __name__ == "__main__":
     app = MurraysCLI()
     app.run()
@@ -0,0 +1,153 @@
+"""
+Offline analysis of recorded .mid files.
+
+Each file is streamed through mido, cut into fixed time windows and every
+window's sounding notes are named with ChordIdentifier; melodic intervals
+between successive note-ons are tallied and a running key estimate (decaying
+over key_half_life seconds) is reported per window, plus one for the file. Files are spread over a process pool
+and results are written as NDJSON (one line per file) as they complete.
+
+    python -m murrays_cli.midi_file_analysis recordings/ --out results.ndjson --workers 8
+"""
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+from collections import Counter
+from functools import partial
+
+import mido
+from .theory_engine import TheoryEngine
+from .chord_identifier import ChordIdentifier
+from .key_detection import KeyDetector
+
+def iter_midi_files(paths):
+    """Yields .mid/.midi files from files and directories (recursively)."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(('.mid', '.midi')):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def iter_windows(messages, window=0.5):
+    """
+    Groups a timed message stream (mido.MidiFile iteration: msg.time = seconds
+    since the previous message) into (start_time, sounding_midi_notes, onsets).
+    A note counts for every window it is held in. Empty windows are skipped.
+    """
+    now = 0.0
+    window_start = 0.0
+    held = set()
+    sounding = set()
+    onsets = []
+
+    for msg in messages:
+        now += msg.time
+        while now >= window_start + window:
+            if sounding:
+                yield window_start, sounding, onsets
+            window_start += window
+            sounding = set(held)
+            onsets = []
+            if not held and now >= window_start + window:
+                # Skip silence in one jump
+                window_start += ((now - window_start) // window) * window
+
+        if msg.type == 'note_on' and msg.velocity > 0:
+            held.add(msg.note)
+            sounding.add(msg.note)
+            onsets.append(msg.note)
+        elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
+            held.discard(msg.note)
+            if now <= window_start and msg.note not in onsets:
+                # Released right on the boundary: it belonged to the previous window
+                sounding.discard(msg.note)
+
+    if sounding:
+        yield window_start, sounding, onsets
+
+def analyze_messages(messages, window=0.5, key_half_life=8.0):
+    windows = []
+    intervals = Counter()
+    chords = Counter()
+    last_onset = None
+    local_key = KeyDetector(half_life=key_half_life)
+    file_key = KeyDetector(half_life=None)
+
+    for start, sounding, onsets in iter_windows(messages, window):
+        notes = sorted(sounding)
+        chord = ChordIdentifier.identify(notes) if len(notes) >= 3 else None
+        if chord:
+            chords[chord["chord"]] += 1
+        # Melodic intervals between successive note-ons
+        for note in onsets:
+            if last_onset is not None:
+                intervals[TheoryEngine.INTERVAL_NAMES[abs(note - last_onset) % 12]] += 1
+            last_onset = note
+            local_key.note_on(note, start)
+            file_key.note_on(note, start)
+        key = local_key.estimate()
+        windows.append({
+            "start": round(start, 3),
+            "notes": [TheoryEngine.midi_to_note(n) for n in notes],
+            "chord": chord["chord"] if chord else None,
+            "key": key.name if key else None,
+        })
+
+    key = file_key.estimate()
+    return {"windows": windows, "chords": dict(chords), "intervals": dict(intervals),
+            "key": key.name if key else None}
+
+def analyze_file(path, window=0.5, key_half_life=8.0):
+    """Full analysis of one file. Errors are reported in the result, not raised."""
+    try:
+        midi = mido.MidiFile(path)
+        result = analyze_messages(midi, window, key_half_life)
+        result["duration"] = round(midi.length, 3)
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+    result["file"] = path
+    return result
+
+def run(paths, out, window=0.5, workers=None, chunksize=8, key_half_life=8.0):
+    """
+    Analyzes every file under paths with a process pool and writes one JSON line
+    per file to `out` (a writable text file) in completion order.
+    Returns (files_done, files_failed).
+    """
+    done = failed = 0
+    job = partial(analyze_file, window=window, key_half_life=key_half_life)
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(job, iter_midi_files(paths), chunksize=chunksize):
+            out.write(json.dumps(result) + "\n")
+            done += 1
+            if "error" in result:
+                failed += 1
+            if done % 100 == 0:
+                out.flush()
+    out.flush()
+    return done, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch chord/interval analysis of .mid files.")
+    parser.add_argument("paths", nargs="+", help=".mid files or directories")
+    parser.add_argument("--out", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--window", type=float, default=0.5, help="analysis window in seconds")
+    parser.add_argument("--key-half-life", type=float, default=8.0, help="seconds for the running key estimate to forget half its notes")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        done, failed = run(args.paths, out, args.window, args.workers, key_half_life=args.key_half_life)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Analyzed {done} files ({failed} failed).", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,206 @@
-import mido
 import threading
 import time
+from collections import deque, namedtuple
 from .theory_engine import TheoryEngine
 
+# One note change as delivered by the port.
+# timestamp: time.monotonic() when the message reached us.
+MidiEvent = namedtuple("MidiEvent", ["kind", "note", "velocity", "timestamp"]) # kind: "on" / "off"
+
+# Coalesced mode: everything that changed in one window.
+# active: sorted MIDI numbers held at the end of the window, deltas: MidiEvents in arrival order.
+MidiSnapshot = namedtuple("MidiSnapshot", ["active", "deltas", "timestamp"])
+
+class LatencyStats:
+    """Rolling latency samples in seconds (last `size` events)."""
+    def __init__(self, size=1024):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self):
+        samples = list(self.samples)
+        return {
+            "count": self.count,
+            "mean_ms": (sum(samples) / len(samples) * 1000) if samples else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
 class MidiManager:
-    def __init__(self, callback=None):
+    """
+    Event-driven MIDI input. The port is opened in mido callback mode, so the
+    backend thread hands each message over as it arrives (no polling/sleeping).
+
+    With coalesce_window (seconds) set, events are collected for that long after
+    the first one and delivered together: callback once per window and
+    snapshot_callback with a MidiSnapshot. align_to_frames snaps window ends to
+    multiples of the window, i.e. at most one delivery per frame.
+    """
+    def __init__(self, callback=None, event_callback=None, coalesce_window=None, snapshot_callback=None, align_to_frames=False):
         self.callback = callback # Function(active_notes_list)
+        self.event_callback = event_callback # Function(MidiEvent), optional, per event (uncoalesced only)
+        self.snapshot_callback = snapshot_callback # Function(MidiSnapshot), optional
+        self.coalesce_window = coalesce_window
+        self.align_to_frames = align_to_frames
         self.active_notes = set() # MIDI numbers
         self.running = False
-        self.thread = None
+        self.port = None
         self.input_port_name = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.pending = [] # Deltas of the open coalescing window
+        self.deadline = None # monotonic() end of the open window
+        self.window_ready = threading.Condition(self.lock)
+        self.flush_thread = None
+        self.latency = LatencyStats() # Arrival -> callback start
+        self.callback_time = LatencyStats() # Time spent inside callbacks
 
     def list_ports(self):
+        import mido # Deferred: the MIDI backend is only loaded when ports are used
         return mido.get_input_names()
 
     def start(self, port_name=None):
         if self.running: return
-        
+
         ports = self.list_ports()
         if not ports:
             print("No MIDI ports found.")
             return
-        
+
         if port_name:
             self.input_port_name = port_name
         else:
             self.input_port_name = ports[0]
-            
+
+        import mido
+        self.stop_event.clear()
+        try:
+            self.port = mido.open_input(self.input_port_name, callback=self._on_message)
+        except Exception as e:
+            print(f"MIDI Error: {e}")
+            return
         self.running = True
-        self.thread = threading.Thread(target=self._listen)
-        self.thread.daemon = True
-        self.thread.start()
+        if self.coalesce_window:
+            self.flush_thread = threading.Thread(target=self._flush_loop)
+            self.flush_thread.daemon = True
+            self.flush_thread.start()
         print(f"MIDI Listening on {self.input_port_name}...")
 
     def stop(self):
+        # Signal first so any in-flight message is dropped, then release the port
+        self.stop_event.set()
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
+        if self.port:
+            self.port.close()
+            self.port = None
+        with self.window_ready:
+            self.window_ready.notify_all()
+        if self.flush_thread:
+            self.flush_thread.join(timeout=1.0)
+            self.flush_thread = None
+
+    def latency_stats(self):
+        return {"dispatch": self.latency.snapshot(), "callback": self.callback_time.snapshot()}
+
+    def _on_message(self, msg):
+        # Runs on the MIDI backend's thread
+        arrived = time.monotonic()
+        if self.stop_event.is_set():
+            return
+
+        if msg.type == 'note_on' and msg.velocity > 0:
+            event = MidiEvent("on", msg.note, msg.velocity, arrived)
+        elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
+            event = MidiEvent("off", msg.note, 0, arrived)
+        else:
+            return
+
+        with self.lock:
+            if event.kind == "on":
+                self.active_notes.add(msg.note)
+            elif msg.note in self.active_notes:
+                self.active_notes.remove(msg.note)
+            else:
+                return
+
+            if self.coalesce_window:
+                # Open a window on the first event; the flush thread delivers it
+                self.pending.append(event)
+                if self.deadline is None:
+                    self.deadline = self._window_end(arrived)
+                    self.window_ready.notify()
+                return
+            active = list(self.active_notes)
+
+        self._dispatch(event, active)
+
+    def _window_end(self, now):
+        window = self.coalesce_window
+        if self.align_to_frames:
+            return (int(now / window) + 1) * window
+        return now + window
 
-    def _listen(self):
+    def _flush_loop(self):
+        while not self.stop_event.is_set():
+            with self.window_ready:
+                if self.deadline is None:
+                    self.window_ready.wait()
+                    continue
+                remaining = self.deadline - time.monotonic()
+                if remaining > 0:
+                    self.window_ready.wait(remaining)
+                    continue
+                deltas = self.pending
+                self.pending = []
+                self.deadline = None
+                active = sorted(self.active_notes)
+            if deltas and not self.stop_event.is_set():
+                self._dispatch_snapshot(MidiSnapshot(tuple(active), deltas, time.monotonic()))
+
+    def _dispatch(self, event, active):
+        start = time.monotonic()
+        self.latency.add(start - event.timestamp)
+
+        if self.event_callback:
+            self._call(self.event_callback, event)
+        if self.callback:
+            # Convert MIDI # to Note Names
+            note_names = [TheoryEngine.midi_to_note(n) for n in active]
+            self._call(self.callback, note_names)
+
+        self.callback_time.add(time.monotonic() - start)
+
+    def _dispatch_snapshot(self, snapshot):
+        start = snapshot.timestamp
+        for event in snapshot.deltas:
+            self.latency.add(start - event.timestamp)
+
+        if self.snapshot_callback:
+            self._call(self.snapshot_callback, snapshot)
+        if self.callback:
+            self._call(self.callback, [TheoryEngine.midi_to_note(n) for n in snapshot.active])
+
+        self.callback_time.add(time.monotonic() - start)
+
+    @staticmethod
+    def _call(callback, arg):
+        # A failing callback is reported and skipped; it must not kill the
+        # flush thread (or the backend's) and freeze input for the session
         try:
-            with mido.open_input(self.input_port_name) as inport:
-                while self.running:
-                    # Poll instead of block forever so we can check self.running
-                    msg = inport.poll()
-                    if msg:
-                        updated = False
-                        if msg.type == 'note_on' and msg.velocity > 0:
-                            self.active_notes.add(msg.note)
-                            updated = True
-                        elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                            if msg.note in self.active_notes:
-                                self.active_notes.remove(msg.note)
-                                updated = True
-                        
-                        if updated and self.callback:
-                            # Convert MIDI # to Note Names
-                            note_names = [TheoryEngine.midi_to_note(n) for n in self.active_notes]
-                            self.callback(note_names)
-                    else:
-                        time.sleep(0.01)
+            callback(arg)
         except Exception as e:
-            print(f"MIDI Error: {e}")
-            self.running = False
+            print(f"MIDI callback error: {e!r}")
@@ -0,0 +1,151 @@
+from array import array
+
+from .theory_engine import TheoryEngine
+
+# Forte's catalogue for cardinalities 3-6, as his prime forms (T = 10). Sets of
+# size 12-n are the complements of n-k and share the number (7-Z12 <-> 5-Z12).
+FORTE_CATALOGUE = {
+    3: ["012", "013", "014", "015", "016", "024", "025", "026", "027", "036", "037", "048"],
+    4: ["0123", "0124", "0134", "0125", "0126", "0127", "0145", "0156", "0167", "0235",
+        "0135", "0236", "0136", "0237", "Z0146", "0157", "0347", "0147", "0148", "0158",
+        "0246", "0247", "0257", "0248", "0268", "0358", "0258", "0369", "Z0137"],
+    5: ["01234", "01235", "01245", "01236", "01237", "01256", "01267", "02346", "01246", "01346",
+        "02347", "Z01356", "01248", "01257", "01268", "01347", "Z01348", "Z01457", "01367", "01378",
+        "01458", "01478", "02357", "01357", "02358", "02458", "01358", "02368", "01368", "01468",
+        "01369", "01469", "02468", "02469", "02479", "Z01247", "Z03458", "Z01258"],
+    6: ["012345", "012346", "Z012356", "Z012456", "012367", "Z012567", "012678", "023457", "012357", "Z013457",
+        "Z012457", "Z012467", "Z013467", "013458", "012458", "014568", "Z012478", "012578", "Z013478", "014589",
+        "023468", "012468", "Z023568", "Z013468", "Z013568", "Z013578", "013469", "Z013569", "Z013689", "013679",
+        "013589", "024579", "023579", "013579", "02468T", "Z012347", "Z012348", "Z012378", "Z023458", "Z012358",
+        "Z012368", "Z012369", "Z012568", "Z012569", "Z023469", "Z012469", "Z012479", "Z012579", "Z013479", "Z014679"],
+}
+
+_TABLES = None
+
+def _pcs(mask):
+    return [pc for pc in range(12) if mask >> pc & 1]
+
+def _mask(pcs):
+    mask = 0
+    for pc in pcs:
+        mask |= 1 << (pc % 12)
+    return mask
+
+def _packing(ordered):
+    # Forte's ordering: smallest span first, then packed from the left
+    first = ordered[0]
+    intervals = [(pc - first) % 12 for pc in ordered]
+    return [intervals[-1]] + intervals[1:-1]
+
+def _normal_order(pcs):
+    """Forte normal order of a sorted pc list; ties go to the lowest starting pc."""
+    rotations = [pcs[i:] + pcs[:i] for i in range(len(pcs))]
+    return min(rotations, key=lambda r: (_packing(r), r[0]))
+
+def _prime(pcs):
+    """Prime form (Forte) as a tuple starting on 0."""
+    candidates = []
+    for version in (pcs, sorted((-pc) % 12 for pc in pcs)):
+        normal = _normal_order(version)
+        candidates.append(tuple((pc - normal[0]) % 12 for pc in normal))
+    return min(candidates, key=lambda c: _packing(list(c)))
+
+def _interval_vector(pcs):
+    icv = [0] * 6
+    for i, a in enumerate(pcs):
+        for b in pcs[i + 1:]:
+            d = (b - a) % 12
+            icv[min(d, 12 - d) - 1] += 1
+    return icv
+
+def _build_tables():
+    """
+    Per 12-bit mask: normal-order start pc, prime form mask, Forte name index
+    and interval-class vector, all in flat arrays (about 40 KB together).
+    """
+    normal_start = array("b", [-1]) * 4096
+    prime = array("H", [0]) * 4096
+    forte = array("H", [0]) * 4096
+    icv = array("B", [0]) * (4096 * 6)
+
+    primes = {}
+    for mask in range(1, 4096):
+        pcs = _pcs(mask)
+        normal = _normal_order(pcs)
+        normal_start[mask] = normal[0]
+        p = _prime(pcs)
+        primes[mask] = p
+        prime[mask] = _mask(p)
+        icv[mask * 6:mask * 6 + 6] = array("B", _interval_vector(pcs))
+
+    # Name every set class: catalogued sizes directly, the rest as complements
+    names = ["0-1", "1-1"] + [f"2-{k}" for k in range(1, 7)]
+    by_prime = {(): 0, (0,): 1}
+    by_prime.update({(0, k): 1 + k for k in range(1, 7)})
+    for size, entries in FORTE_CATALOGUE.items():
+        for k, entry in enumerate(entries, 1):
+            z = "Z" if entry.startswith("Z") else ""
+            listed = tuple(10 if c == "T" else int(c) for c in entry.lstrip("Z"))
+            canonical = _prime(list(listed))
+            if canonical in by_prime:
+                raise ValueError(f"{size}-{z}{k} duplicates another set class")
+            by_prime[canonical] = len(names)
+            names.append(f"{size}-{z}{k}")
+    for mask in range(4095, 0, -1):
+        p = primes[mask]
+        if p in by_prime:
+            continue
+        complement = _prime(_pcs(0xFFF & ~_mask(p))) if len(p) < 12 else ()
+        base = names[by_prime[complement]]
+        size, number = base.split("-")
+        by_prime[p] = len(names)
+        names.append(f"{len(p)}-{number}")
+    for mask in range(1, 4096):
+        forte[mask] = by_prime[primes[mask]]
+    return {"normal_start": normal_start, "prime": prime, "forte": forte, "icv": icv, "names": tuple(names)}
+
+def tables():
+    """The lookup arrays, built on first use (about a tenth of a second)."""
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = _build_tables()
+    return _TABLES
+
+class PitchClassSets:
+    """Constant-time set-class lookups by 12-bit pitch-class mask (bit 0 = C)."""
+
+    @staticmethod
+    def mask_of(notes):
+        """Mask from note names or MIDI numbers."""
+        return _mask(n if isinstance(n, int) else TheoryEngine.note_to_midi(n) for n in notes)
+
+    @staticmethod
+    def normal_form(mask):
+        start = tables()["normal_start"][mask]
+        if start < 0:
+            return []
+        pcs = _pcs(mask)
+        i = pcs.index(start)
+        return pcs[i:] + pcs[:i]
+
+    @staticmethod
+    def prime_form(mask):
+        return _pcs(tables()["prime"][mask])
+
+    @staticmethod
+    def forte_name(mask):
+        return tables()["names"][tables()["forte"][mask]]
+
+    @staticmethod
+    def interval_vector(mask):
+        return list(tables()["icv"][mask * 6:mask * 6 + 6])
+
+    @staticmethod
+    def describe(mask):
+        """All fields for one set, as used by /api/analyze."""
+        return {
+            "normal_form": PitchClassSets.normal_form(mask),
+            "prime_form": PitchClassSets.prime_form(mask),
+            "forte": PitchClassSets.forte_name(mask),
+            "interval_vector": PitchClassSets.interval_vector(mask),
+        }
@@ -0,0 +1,224 @@
+import os
+import time
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+DEFAULT_PATH = os.environ.get("MURRAY_PROGRESS_DB", os.path.join(os.path.expanduser("~"), ".murray", "progress.db"))
+
+# One graded try at a challenge. created: time.time()
+Attempt = namedtuple("Attempt", ["student", "topic", "challenge_index", "correct", "duration_ms", "created"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    challenge_index INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    duration_ms INTEGER,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_student_topic ON attempts (student, topic, created);
+CREATE INDEX IF NOT EXISTS attempts_topic ON attempts (topic);
+
+CREATE TABLE IF NOT EXISTS progress (
+    student TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    next_index INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,
+    PRIMARY KEY (student, topic)
+) WITHOUT ROWID;
+"""
+
+class ProgressStore:
+    """
+    Student progress and attempt history in SQLite (WAL mode).
+
+    Reads use a small per-process connection pool. Attempts are queued by
+    record_attempt() and written by a background thread in batches (one
+    transaction per batch of up to batch_size, at least every flush_interval
+    seconds), which also advances each student's next challenge on a pass.
+    Safe to create before a fork: connections and the writer thread are
+    (re)created lazily in the process that uses them.
+    """
+    def __init__(self, path=DEFAULT_PATH, pool_size=4, batch_size=500, flush_interval=0.25):
+        self.path = path
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pid = None
+        self._init_lock = threading.Lock()
+
+    # --- connections -------------------------------------------------------
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._init_lock:
+            if self._pid == os.getpid():
+                return
+            # Fresh process (or first use): never reuse a parent's connections/thread
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._pool = queue.LifoQueue(maxsize=self.pool_size)
+            self._queue = queue.Queue()
+            self._stop = threading.Event()
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._pool.put(conn)
+            self._writer = threading.Thread(target=self._write_loop, name="progress-writer")
+            self._writer.daemon = True
+            self._writer.start()
+            self._pid = os.getpid()
+            atexit.register(self.close) # Write out whatever is still queued
+
+    @contextmanager
+    def connection(self):
+        self._ensure_started()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    # --- writes ------------------------------------------------------------
+
+    @staticmethod
+    def check_attempt(student, topic, challenge_index, correct, duration_ms=None):
+        """Raises TypeError unless the fields have the types the tables store."""
+        def is_int(value):
+            return isinstance(value, int) and not isinstance(value, bool)
+        if not isinstance(student, str) or not isinstance(topic, str):
+            raise TypeError("student and topic must be strings")
+        if not is_int(challenge_index):
+            raise TypeError("challenge_index must be an int")
+        if not isinstance(correct, bool):
+            raise TypeError("correct must be a bool")
+        if duration_ms is not None and not is_int(duration_ms):
+            raise TypeError("duration_ms must be an int or None")
+
+    def record_attempt(self, student, topic, challenge_index, correct, duration_ms=None):
+        """Queues an attempt; it is written with the next batch. Raises TypeError on bad fields."""
+        ProgressStore.check_attempt(student, topic, challenge_index, correct, duration_ms)
+        self._ensure_started()
+        self._queue.put(Attempt(student, topic, challenge_index, correct, duration_ms, time.time()))
+
+    def _write_loop(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch_safely(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch_safely(self, batch):
+        # Never let one bad row kill the writer thread or take the rest of the batch with it
+        try:
+            self._write_batch(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"Progress store dropped attempt {batch[0]!r}: {e}")
+                return
+        for attempt in batch:
+            self._write_batch_safely([attempt])
+
+    def _write_batch(self, batch):
+        # Furthest passed challenge per (student, topic) in this batch
+        advanced = {}
+        for a in batch:
+            if a.correct:
+                key = (a.student, a.topic)
+                advanced[key] = max(advanced.get(key, 0), a.challenge_index + 1)
+        now = time.time()
+        with self.connection() as conn:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO attempts (student, topic, challenge_index, correct, duration_ms, created) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(a.student, a.topic, a.challenge_index, int(a.correct), a.duration_ms, a.created) for a in batch])
+                conn.executemany(
+                    "INSERT INTO progress (student, topic, next_index, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (student, topic) DO UPDATE SET "
+                    "next_index = MAX(next_index, excluded.next_index), updated = excluded.updated",
+                    [(student, topic, next_index, now) for (student, topic), next_index in advanced.items()])
+
+    def flush(self):
+        """Blocks until every queued attempt has been written."""
+        self._ensure_started()
+        self._queue.join()
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._writer.join(timeout=5.0)
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._pid = None
+
+    # --- queries -----------------------------------------------------------
+
+    def next_challenge(self, student, topic):
+        """Index of the first challenge the student has not passed yet."""
+        with self.connection() as conn:
+            row = conn.execute("SELECT next_index FROM progress WHERE student = ? AND topic = ?", (student, topic)).fetchone()
+        return row[0] if row else 0
+
+    def progress(self, student):
+        """{topic: next_index} for one student."""
+        with self.connection() as conn:
+            rows = conn.execute("SELECT topic, next_index FROM progress WHERE student = ?", (student,)).fetchall()
+        return dict(rows)
+
+    def topic_stats(self, topic, student=None):
+        """Attempt count, passes, accuracy and mean duration for a topic (optionally one student)."""
+        sql = "SELECT COUNT(*), COALESCE(SUM(correct), 0), AVG(duration_ms) FROM attempts WHERE topic = ?"
+        args = [topic]
+        if student is not None:
+            sql += " AND student = ?"
+            args.append(student)
+        with self.connection() as conn:
+            attempts, passed, avg_ms = conn.execute(sql, args).fetchone()
+        return {
+            "topic": topic,
+            "attempts": attempts,
+            "passed": passed,
+            "accuracy": passed / attempts if attempts else 0.0,
+            "avg_duration_ms": avg_ms,
+        }
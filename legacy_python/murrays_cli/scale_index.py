@@ -0,0 +1,93 @@
+from .theory_engine import TheoryEngine
+
+class ScaleIndex:
+    """
+    Reverse index from played pitch classes to the scales that contain them.
+    TABLE[mask] lists every (root_pc, mode) whose scale is a superset of the
+    12-bit pitch-class mask, already ranked, so a lookup only touches matches.
+    """
+
+    MODE_NAMES = tuple(TheoryEngine.MODES)
+    MODE_SIZES = tuple(len(TheoryEngine.MODES[m]) for m in MODE_NAMES)
+    _RANKED = {} # (mask, bass_pc) -> lookup() result, filled on first use
+
+    @staticmethod
+    def scale_mask(root_pc, pattern):
+        mask = 0
+        for s in pattern:
+            mask |= 1 << ((root_pc + s) % 12)
+        return mask
+
+    @staticmethod
+    def _build_table():
+        table = [[] for _ in range(4096)]
+        for mode_idx, mode in enumerate(ScaleIndex.MODE_NAMES):
+            pattern = TheoryEngine.MODES[mode]
+            for root_pc in range(12):
+                full = ScaleIndex.scale_mask(root_pc, pattern)
+                # Every non-empty subset of the scale (standard submask walk)
+                sub = full
+                while sub:
+                    table[sub].append((len(pattern), not sub >> root_pc & 1, mode_idx, root_pc))
+                    sub = (sub - 1) & full
+        # Rank: tightest scale first, then scales whose root was played, then MODES order
+        return tuple(tuple((root_pc, mode_idx) for _, _, mode_idx, root_pc in sorted(entry))
+                     for entry in table)
+
+    @staticmethod
+    def pitch_class_mask(notes):
+        mask = 0
+        for n in notes:
+            m = n if isinstance(n, int) else TheoryEngine.note_to_midi(n)
+            mask |= 1 << (m % 12)
+        return mask
+
+    @staticmethod
+    def lookup(mask, bass_pc=None):
+        """
+        Ranked (root_pc, mode_idx) pairs for a pitch-class mask. With bass_pc,
+        scales rooted on the bass note move ahead of others of the same size.
+        """
+        mask &= 0xFFF
+        matches = ScaleIndex.TABLE[mask] if mask else ()
+        if bass_pc is None:
+            return matches
+        # Each (mask, bass) is ranked once and kept: at most 4096 * 12 entries
+        key = (mask, bass_pc)
+        ranked = ScaleIndex._RANKED.get(key)
+        if ranked is None:
+            sizes = ScaleIndex.MODE_SIZES
+            ranked = tuple(sorted(matches, key=lambda m: (sizes[m[1]], m[0] != bass_pc))) # Stable
+            ScaleIndex._RANKED[key] = ranked
+        return ranked
+
+    @staticmethod
+    def scales_containing(notes, limit=None, spelling="sharp"):
+        """
+        notes: note names or MIDI numbers. Returns dicts with scale, root,
+        mode, fit (share of the scale that was played) and missing notes.
+        """
+        notes = list(notes)
+        if not notes:
+            return []
+        midis = [n if isinstance(n, int) else TheoryEngine.note_to_midi(n) for n in notes]
+        mask = ScaleIndex.pitch_class_mask(midis)
+        played = bin(mask).count("1")
+        names = TheoryEngine.FLAT_NOTES if spelling == "flat" else TheoryEngine.NOTES
+
+        results = []
+        for root_pc, mode_idx in ScaleIndex.lookup(mask, min(midis) % 12):
+            mode = ScaleIndex.MODE_NAMES[mode_idx]
+            pattern = TheoryEngine.MODES[mode]
+            results.append({
+                "scale": f"{names[root_pc]} {mode}",
+                "root": names[root_pc],
+                "mode": mode,
+                "fit": round(played / len(pattern), 3),
+                "missing": [names[(root_pc + s) % 12] for s in pattern if not mask >> ((root_pc + s) % 12) & 1],
+            })
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+ScaleIndex.TABLE = ScaleIndex._build_table()
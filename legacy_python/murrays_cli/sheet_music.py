@@ -1,86 +1,219 @@
 import os
+from html import escape
+from .theory_engine import TheoryEngine
+
+# Staff geometry (treble clef).
+# Lines: F5 (70), D5 (82), B4 (94), G4 (106), E4 (118)
+WIDTH = 400
+HEIGHT = 220
+LINE_GAP = 12
+TOP_LINE_Y = 70 # F5
+BOTTOM_LINE_Y = 118 # E4
+
+# Diatonic steps relative to C4 (C4 -> 0, D4 -> 1 ... B4 -> 6, C5 -> 7)
+_DIATONIC = {'C': 0, 'D': 1, 'E': 2, 'F': 3, 'G': 4, 'A': 5, 'B': 6}
+_LOW_STEP = -35 # C-1
+_HIGH_STEP = 41 # B9
+
+def _step_y(step):
+    # E4 (bottom line) is step 2.
+    return BOTTOM_LINE_Y - (step - 2) * (LINE_GAP // 2)
+
+def _build_note_steps():
+    # Every spelled note name TheoryEngine knows -> diatonic step
+    return {name: (int(name.lstrip('ABCDEFG#bx')) - 4) * 7 + _DIATONIC[name[0]]
+            for name in TheoryEngine.NOTE_TO_MIDI}
+
+def _build_step_fragments():
+    # Per step: everything a note at that height draws before its label text.
+    # Head/stem/ledger come from <defs> symbols, so only y varies.
+    fragments = {}
+    for step in range(_LOW_STEP, _HIGH_STEP + 1):
+        cy = _step_y(step)
+        parts = [f'<use href="#mm-head" y="{cy}"/>']
+
+        # Stem: up below the middle line (B4 = step 6), down from there
+        parts.append(f'<use href="#mm-stem-up" y="{cy}"/>' if step < 6 else f'<use href="#mm-stem-down" y="{cy}"/>')
+
+        # Ledger Lines (C4 and below, A5 and above)
+        # C4 is step 0. Bottom line E4 is step 2.
+        # A5 is step 12. Top line F5 is step 10.
+        for ledger in range(step, 1):
+            if ledger % 2 == 0:
+                parts.append(f'<use href="#mm-ledger" y="{_step_y(ledger)}"/>')
+        for ledger in range(12, step + 1):
+            if ledger % 2 == 0:
+                parts.append(f'<use href="#mm-ledger" y="{_step_y(ledger)}"/>')
+
+        # LABEL (Note Name): below stem-up notes, above stem-down notes
+        label_y = cy + 25 if step < 6 else cy - 25
+        parts.append(f'<text y="{label_y}">')
+        fragments[step] = ''.join(parts)
+    return fragments
+
+# Shared symbols: noteheads, stems and ledgers are drawn with <use>
+_DEFS = ('<defs>'
+         f'<ellipse id="mm-head" rx="{LINE_GAP * 0.65:g}" ry="{LINE_GAP * 0.45:g}" fill="#1d1d1f"/>'
+         '<line id="mm-stem-up" x1="6" y1="0" x2="6" y2="-35" stroke="#1d1d1f" stroke-width="2"/>'
+         '<line id="mm-stem-down" x1="-6" y1="0" x2="-6" y2="35" stroke="#1d1d1f" stroke-width="2"/>'
+         '<line id="mm-ledger" x1="-10" y1="0" x2="10" y2="0" stroke="#999" stroke-width="2"/>'
+         '</defs>')
+
+# Label text attributes are inherited from this group
+_LABEL_GROUP = '<g font-family="sans-serif" font-size="10" fill="#0071e3" text-anchor="middle" font-weight="bold">'
+
+def _staff_lines(x1, x2):
+    return ''.join(f'<line x1="{x1}" y1="{TOP_LINE_Y + i * LINE_GAP}" x2="{x2}" y2="{TOP_LINE_Y + i * LINE_GAP}" stroke="#999" stroke-width="2"/>'
+                   for i in range(5))
+
+def _build_header():
+    # Draw Staff Lines
+    return (f'<svg width="{WIDTH}" height="{HEIGHT}" xmlns="http://www.w3.org/2000/svg" style="background:transparent">'
+            + _DEFS + _staff_lines(20, WIDTH - 20) + _LABEL_GROUP)
 
 class SheetMusicGenerator:
+    VERSION = 2 # Bump when the SVG output changes (part of the web cache key)
+
+    START_X = 100
+    SPACING_X = 40
+
+    NOTE_STEPS = _build_note_steps()
+    STEP_FRAGMENTS = _build_step_fragments()
+    HEADER = _build_header()
+    FOOTER = '</g></svg>'
+
+    @staticmethod
+    def get_diatonic_step(note_name):
+        step = SheetMusicGenerator.NOTE_STEPS.get(note_name)
+        if step is None:
+            # Unknown spelling: letter + trailing octave digit
+            step = (int(note_name[-1]) - 4) * 7 + _DIATONIC[note_name[0]]
+        return step
+
     @staticmethod
     def generate_svg(notes, filename="output.svg"):
         """
         Generates a simple SVG of the notes on a treble staff with labels.
         notes: List of note names e.g. ["C4", "E4", "G4"]
+        Up to 5 notes are stacked as a chord, longer lists are drawn in order.
         """
-        width = 400
-        height = 220
-        
-        # Staff Geometry
-        line_gap = 12
-        top_line_y = 70 # F5
-        # Lines: F5 (70), D5 (82), B4 (94), G4 (106), E4 (118)
-        
-        def get_diatonic_step(note_name):
-            # C4 -> 0, D4 -> 1 ... B4 -> 6, C5 -> 7
-            letter = note_name[0]
-            octave = int(note_name[-1])
-            d_indices = {'C': 0, 'D': 1, 'E': 2, 'F': 3, 'G': 4, 'A': 5, 'B': 6}
-            return (octave - 4) * 7 + d_indices[letter]
-
-        # E4 (bottom line) is step 2 relative to C4.
-        # Y of E4 = 118.
-        # Formula: Y = 118 - (step - 2) * (line_gap / 2)
-        
-        svg_content = f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg" style="background:transparent">'
-        
-        # Draw Staff Lines
-        for i in range(5):
-            y = top_line_y + (i * line_gap)
-            svg_content += f'<line x1="20" y1="{y}" x2="{width-20}" y2="{y}" stroke="#999" stroke-width="2" />'
-            
+        get_step = SheetMusicGenerator.get_diatonic_step
+        fragments = SheetMusicGenerator.STEP_FRAGMENTS
+        known = SheetMusicGenerator.NOTE_STEPS
+
         is_chord = len(notes) <= 5
-        start_x = 100
-        spacing_x = 40
-        
-        # Sort notes to draw bottom-up for cleaner stacking
-        sorted_notes = sorted(notes, key=lambda n: (int(n[-1]), n[0]))
-        
-        for i, note in enumerate(sorted_notes):
-            step = get_diatonic_step(note)
-            cy = 118 - (step - 2) * (line_gap / 2)
+        start_x = SheetMusicGenerator.START_X
+        spacing_x = SheetMusicGenerator.SPACING_X
+
+        # Sort chord notes to draw bottom-up for cleaner stacking
+        ordered = sorted(notes, key=get_step) if is_chord else notes
+
+        out = [SheetMusicGenerator.HEADER]
+        append = out.append
+        for i, note in enumerate(ordered):
+            step = get_step(note)
             cx = start_x + (0 if is_chord else i * spacing_x)
-            
-            # Note Head
-            svg_content += f'<ellipse cx="{cx}" cy="{cy}" rx="{line_gap*0.65}" ry="{line_gap*0.45}" fill="#1d1d1f" />'
-            
-            # Stem
-            if step < 6: # Up
-                svg_content += f'<line x1="{cx+6}" y1="{cy}" x2="{cx+6}" y2="{cy-35}" stroke="#1d1d1f" stroke-width="2" />'
-            else: # Down
-                svg_content += f'<line x1="{cx-6}" y1="{cy}" x2="{cx-6}" y2="{cy+35}" stroke="#1d1d1f" stroke-width="2" />'
-            
-            # Ledger Lines (C4 and below, A5 and above)
-            # C4 is step 0. Bottom line E4 is step 2.
-            # A5 is step 12. Top line F5 is step 10.
-            
-            # Low Ledgers
-            curr_step = step
-            while curr_step <= 0:
-                ly = 118 - (curr_step - 2) * (line_gap / 2)
-                if curr_step % 2 == 0:
-                    svg_content += f'<line x1="{cx-10}" y1="{ly}" x2="{cx+10}" y2="{ly}" stroke="#999" stroke-width="2" />'
-                curr_step += 1
-            
-            # High Ledgers
-            curr_step = step
-            while curr_step >= 12:
-                ly = 118 - (curr_step - 2) * (line_gap / 2)
-                if curr_step % 2 == 0:
-                     svg_content += f'<line x1="{cx-10}" y1="{ly}" x2="{cx+10}" y2="{ly}" stroke="#999" stroke-width="2" />'
-                curr_step -= 1
-
-            # LABEL (Note Name)
-            # Position below the note (or chord bottom)
-            # If chord, we might overlap. For simplicity in this drill tool, 
-            # we offset X slightly or put it right under/above.
-            
-            label_y = cy + 25 if step < 6 else cy - 25
-            svg_content += f'<text x="{cx}" y="{label_y}" font-family="sans-serif" font-size="10" fill="#0071e3" text-anchor="middle" font-weight="bold">{note}</text>'
-
-        svg_content += '</svg>'
-        return svg_content
\ No newline at end of file
+            append(f'<g transform="translate({cx})">')
+            append(fragments.get(step) or SheetMusicGenerator._step_fragment(step))
+            append(note if note in known else escape(note))
+            append('</text></g>')
+        append(SheetMusicGenerator.FOOTER)
+        return ''.join(out)
+
+    @staticmethod
+    def generate_score_svg(notes, **layout_options):
+        """Multi-system score for long sequences (see ScoreLayout) as one string."""
+        return ''.join(ScoreLayout(**layout_options).iter_svg(notes))
+
+    @staticmethod
+    def _step_fragment(step):
+        # Steps outside the precomputed range (never a valid MIDI note)
+        cy = _step_y(step)
+        stem = "up" if step < 6 else "down"
+        label_y = cy + 25 if step < 6 else cy - 25
+        return f'<use href="#mm-head" y="{cy}"/><use href="#mm-stem-{stem}" y="{cy}"/><text y="{label_y}">'
+
+class ScoreLayout:
+    """
+    Lays long note sequences out as systems (staff rows) of fixed-size measures
+    and emits the SVG incrementally, one measure per chunk.
+    Each system reuses the single-staff geometry shifted down by system_height.
+    """
+    LEFT_MARGIN = 40
+    RIGHT_MARGIN = 20
+    BAR_PADDING = 20 # Space between the last note of a measure and the barline
+
+    def __init__(self, width=800, notes_per_measure=4, spacing_x=SheetMusicGenerator.SPACING_X, system_height=140):
+        self.width = width
+        self.notes_per_measure = notes_per_measure
+        self.spacing_x = spacing_x
+        self.system_height = system_height
+        self.measure_width = notes_per_measure * spacing_x + self.BAR_PADDING
+        usable = width - self.LEFT_MARGIN - self.RIGHT_MARGIN
+        self.measures_per_system = max(1, usable // self.measure_width)
+        self.notes_per_system = self.measures_per_system * notes_per_measure
+
+    def system_count(self, total_notes):
+        return max(1, -(-total_notes // self.notes_per_system))
+
+    def height(self, total_notes):
+        return self.system_count(total_notes) * self.system_height + 40
+
+    def iter_svg(self, notes, total=None):
+        """
+        Yields SVG text chunks for notes (any iterable of note names).
+        total: number of notes, needed up front for the document height;
+        defaults to len(notes).
+        """
+        if total is None:
+            total = len(notes)
+        get_step = SheetMusicGenerator.get_diatonic_step
+        fragments = SheetMusicGenerator.STEP_FRAGMENTS
+        known = SheetMusicGenerator.NOTE_STEPS
+
+        staff_right = self.LEFT_MARGIN + self.measures_per_system * self.measure_width
+        staff_id = f"mm-staff-{staff_right}"
+        yield (f'<svg width="{self.width}" height="{self.height(total)}" xmlns="http://www.w3.org/2000/svg" style="background:transparent">'
+               + _DEFS[:-len('</defs>')]
+               + f'<g id="{staff_id}">{_staff_lines(self.LEFT_MARGIN - 20, staff_right)}</g>'
+               + f'<line id="mm-bar" x1="0" y1="{TOP_LINE_Y}" x2="0" y2="{BOTTOM_LINE_Y}" stroke="#999" stroke-width="2"/>'
+               + '</defs>' + _LABEL_GROUP)
+
+        # Systems start 20px higher than the single staff so the first one hugs the top
+        first_offset = -20
+        measure = []
+        slot = 0 # Note position within the current system
+        system = -1
+        for note in notes:
+            if slot == 0:
+                if measure:
+                    yield ''.join(measure)
+                    measure = []
+                if system >= 0:
+                    yield '</g>'
+                system += 1
+                y = first_offset + system * self.system_height
+                yield f'<g transform="translate(0,{y})"><use href="#{staff_id}"/>'
+
+            bar, pos = divmod(slot, self.notes_per_measure)
+            cx = self.LEFT_MARGIN + bar * self.measure_width + pos * self.spacing_x + self.spacing_x // 2
+            step = get_step(note)
+            measure.append(f'<g transform="translate({cx})">')
+            measure.append(fragments.get(step) or SheetMusicGenerator._step_fragment(step))
+            measure.append(note if note in known else escape(note))
+            measure.append('</text></g>')
+
+            slot += 1
+            if pos == self.notes_per_measure - 1:
+                # Close the measure with a barline and flush it
+                measure.append(f'<use href="#mm-bar" x="{self.LEFT_MARGIN + (bar + 1) * self.measure_width}"/>')
+                yield ''.join(measure)
+                measure = []
+            if slot == self.notes_per_system:
+                slot = 0
+
+        if measure:
+            yield ''.join(measure)
+        if system >= 0:
+            yield '</g>'
+        yield SheetMusicGenerator.FOOTER
@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+import time
+import shutil
+import threading
+
+_ANSI = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+CLEAR_SCREEN = "\033[2J\033[H"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+def _goto(row):
+    return f"\033[{row};1H"
+
+class TerminalRenderer:
+    """
+    Redraws the screen by diffing against the previous frame and rewriting only
+    the changed lines with ANSI cursor addressing (no `clear` subprocess).
+    Frames arriving faster than `fps` are merged: the latest one is drawn when
+    the interval is up.
+    """
+    def __init__(self, fps=30, stream=None):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / fps if fps else 0.0
+        self.previous = [] # Lines currently on screen
+        self.pending = None # Latest frame not drawn yet
+        self.last_draw = 0.0
+        self.timer = None
+        self.full_redraw = True
+        self.lock = threading.RLock()
+        if os.name == 'nt':
+            os.system('') # Enables ANSI escape handling in the Windows console
+
+    def invalidate(self):
+        """Next frame starts from a cleared screen (e.g. after other output)."""
+        with self.lock:
+            self.full_redraw = True
+
+    def draw(self, lines):
+        """Queues a frame (list of lines) and draws it now or at the next frame slot."""
+        with self.lock:
+            self.pending = list(lines)
+            wait = self.last_draw + self.min_interval - time.monotonic()
+            if wait > 0:
+                if self.timer is None:
+                    self.timer = threading.Timer(wait, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            self.timer = None
+            lines = self.pending
+            if lines is None:
+                return
+            self.pending = None
+
+            out = []
+            previous = self.previous
+            if self.full_redraw:
+                out.append(CLEAR_SCREEN)
+                previous = []
+                self.full_redraw = False
+
+            columns = shutil.get_terminal_size().columns
+            old_heights = [self._height(line, columns) for line in previous]
+            row = 1
+            for i, line in enumerate(lines):
+                height = self._height(line, columns)
+                if i >= len(previous) or old_heights[i] != height:
+                    # Layout shifts from here on: rewrite the rest of the screen
+                    out.append(_goto(row) + CLEAR_BELOW + "\r\n".join(lines[i:]))
+                    break
+                if previous[i] != line:
+                    out.append("".join(_goto(row + r) + CLEAR_LINE for r in range(height)))
+                    out.append(_goto(row) + line)
+                row += height
+            else:
+                if len(previous) > len(lines):
+                    out.append(_goto(row) + CLEAR_BELOW)
+
+            if out:
+                # Park the cursor under the frame
+                out.append(_goto(sum(self._height(line, columns) for line in lines) + 1))
+                self.stream.write("".join(out))
+                self.stream.flush()
+            self.previous = lines
+            self.last_draw = time.monotonic()
+
+    def close(self):
+        """Draws any queued frame and stops the frame timer."""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+            self.flush()
+
+    @staticmethod
+    def _height(line, columns):
+        # Physical rows a line takes once the terminal wraps it
+        visible = len(_ANSI.sub('', line))
+        return max(1, -(-visible // columns))
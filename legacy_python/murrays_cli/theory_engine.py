@@ -1,5 +1,37 @@
+import sys
+
+# Lookup tables for note <-> MIDI conversion.
+# Built once at import; every TheoryEngine helper goes through them.
+_LETTER_PITCH = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+_ACCIDENTAL_SHIFT = {'': 0, '#': 1, 'b': -1, '##': 2, 'x': 2, 'bb': -2}
+_SHARP_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+_FLAT_NAMES = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+
+def _build_note_to_midi():
+    # Every spelled name (C4, Bb3, F##4, Cbb5, E#-1 ...) for octaves -1..9,
+    # kept to names that land inside the MIDI range 0..127.
+    table = {}
+    for letter, pitch in _LETTER_PITCH.items():
+        for accidental, shift in _ACCIDENTAL_SHIFT.items():
+            for octave in range(-1, 10):
+                midi = (octave + 1) * 12 + pitch + shift
+                if 0 <= midi < 128:
+                    table[sys.intern(f"{letter}{accidental}{octave}")] = midi
+    return table
+
+def _build_midi_to_note():
+    # One 128-entry table per spelling preference
+    return {
+        spelling: tuple(sys.intern(f"{names[m % 12]}{(m // 12) - 1}") for m in range(128))
+        for spelling, names in (("sharp", _SHARP_NAMES), ("flat", _FLAT_NAMES))
+    }
+
 class TheoryEngine:
-    NOTES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+    NOTES = list(_SHARP_NAMES)
+    FLAT_NOTES = list(_FLAT_NAMES)
+
+    NOTE_TO_MIDI = _build_note_to_midi()
+    MIDI_TO_NOTE = _build_midi_to_note()
     
     INTERVALS = {
         'P1': 0, 'm2': 1, 'M2': 2, 'm3': 3, 'M3': 4,
@@ -7,6 +39,9 @@ class TheoryEngine:
         'm7': 10, 'M7': 11, 'P8': 12
     }
 
+    # Reverse of INTERVALS for 0-11 semitones
+    INTERVAL_NAMES = ['P1', 'm2', 'M2', 'm3', 'M3', 'P4', 'd5', 'P5', 'm6', 'M6', 'm7', 'M7']
+
     TRIAD_FORMULAS = {
         'maj': [0, 4, 7],
         'min': [0, 3, 7],
@@ -19,7 +54,10 @@ class TheoryEngine:
         'min7': [0, 3, 7, 10],
         'dom7': [0, 4, 7, 10],
         'm7b5': [0, 3, 6, 10], # Half-diminished
-        'dim7': [0, 3, 6, 9]   # Fully diminished
+        'dim7': [0, 3, 6, 9],  # Fully diminished
+        # 6th Chords
+        'maj6': [0, 4, 7, 9],
+        'min6': [0, 3, 7, 9]
     }
 
     MODES = {
@@ -48,62 +86,41 @@ class TheoryEngine:
     }
 
     @staticmethod
-    def get_note_from_interval(root_note, semitones):
+    def get_note_from_interval(root_note, semitones, spelling="sharp"):
         """
         Calculates a new note based on root and semitone offset.
-        root_note: e.g., "C4", "A#3"
+        root_note: e.g., "C4", "A#3", "Bb3"
+        spelling: "sharp" or "flat" for the returned name.
         """
         if not root_note: return None
-        
-        # Parse root
-        try:
-            if len(root_note) == 3:
-                note_name = root_note[:2]
-                octave = int(root_note[2])
-            else:
-                note_name = root_note[:1]
-                octave = int(root_note[1])
-        except ValueError:
+
+        root_midi = TheoryEngine.NOTE_TO_MIDI.get(root_note)
+        if root_midi is None:
             return root_note # Return as is if parse fails
 
-        root_index = TheoryEngine.NOTES.index(note_name)
-        
-        new_total_index = root_index + semitones
-        octave_shift = new_total_index // 12
-        normalized_index = new_total_index % 12
-        
-        return f"{TheoryEngine.NOTES[normalized_index]}{octave + octave_shift}"
+        return TheoryEngine.midi_to_note(root_midi + semitones, spelling)
 
     @staticmethod
-    def generate_scale(root_note, pattern):
-        return [TheoryEngine.get_note_from_interval(root_note, interval) for interval in pattern]
+    def generate_scale(root_note, pattern, spelling="sharp"):
+        root_midi = TheoryEngine.NOTE_TO_MIDI.get(root_note)
+        if root_midi is None:
+            return [TheoryEngine.get_note_from_interval(root_note, s) for s in pattern]
+        to_note = TheoryEngine.midi_to_note
+        return [to_note(root_midi + s, spelling) for s in pattern]
 
     @staticmethod
     def note_to_midi(note_name):
-        """Converts C4 to 60"""
-        try:
-            if len(note_name) == 3:
-                note = note_name[:2]
-                octave = int(note_name[2])
-            else:
-                note = note_name[:1]
-                octave = int(note_name[1])
-            
-            # C0 is 12. C-1 is 0. 
-            # MIDI 60 is C4.
-            # Index of C is 0.
-            # 60 = (4 + 1) * 12 + 0
-            
-            idx = TheoryEngine.NOTES.index(note)
-            return (octave + 1) * 12 + idx
-        except:
-            return 0
+        """Converts C4 to 60 (also Bb3, F##4, Cb5). Unknown names give 0."""
+        return TheoryEngine.NOTE_TO_MIDI.get(note_name, 0)
 
     @staticmethod
-    def midi_to_note(midi_number):
-        octave = (midi_number // 12) - 1
-        idx = midi_number % 12
-        return f"{TheoryEngine.NOTES[idx]}{octave}"
+    def midi_to_note(midi_number, spelling="sharp"):
+        """Converts 60 to C4. spelling: "sharp" (A#3) or "flat" (Bb3)."""
+        if 0 <= midi_number < 128:
+            return TheoryEngine.MIDI_TO_NOTE[spelling][midi_number]
+        # Outside the MIDI range: plain arithmetic, same naming scheme
+        names = TheoryEngine.FLAT_NOTES if spelling == "flat" else TheoryEngine.NOTES
+        return f"{names[midi_number % 12]}{(midi_number // 12) - 1}"
 
 class VoicingLogic:
     @staticmethod
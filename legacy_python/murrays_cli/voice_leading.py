@@ -0,0 +1,168 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from .theory_engine import TheoryEngine, VoicingLogic
+from .chord_identifier import ChordIdentifier
+
+# One chosen voicing: chord symbol, shape name ("closed 1st inv", "so what", ...) and MIDI notes (low to high)
+Voicing = namedtuple("Voicing", ["chord", "shape", "midi"])
+
+class VoiceLeading:
+    """
+    Voices a chord progression with the least total hand movement.
+
+    Each chord gets a memoized set of candidate voicings (closed position and
+    its inversions, plus the VoicingLogic shapes that fit the chord quality) in
+    every octave that fits the keyboard range. voice_progression() then runs a
+    Viterbi pass over the chords, keeping only the `beam` cheapest partial
+    paths at each step, so cost grows linearly with the length of the tune.
+    """
+
+    # VoicingLogic shapes (built on a root) and the chord qualities they voice
+    ROOT_SHAPES = {
+        'so what': (VoicingLogic.get_so_what_voicing, ('min7', 'min9')),
+        'kenny barron': (VoicingLogic.get_kenny_barron_voicing, ('min7', 'min9')),
+        'herbie hancock': (VoicingLogic.get_herbie_hancock_voicing, ('dom7', '7sus4', 'dom9')),
+    }
+
+    # Longest suffixes first so "m7b5" isn't read as "m" + junk
+    _SUFFIX_KEYS = sorted(((suffix, key) for key, suffix in ChordIdentifier.SUFFIXES.items()),
+                          key=lambda item: len(item[0]), reverse=True)
+
+    @staticmethod
+    def formulas():
+        formulas = dict(TheoryEngine.TRIAD_FORMULAS)
+        formulas.update(ChordIdentifier.EXTENDED_FORMULAS)
+        return formulas
+
+    @staticmethod
+    def parse_chord(symbol):
+        """
+        "Dm7" -> (2, 'min7'), "Bbmaj7" -> (10, 'maj7'), "G" -> (7, 'maj').
+        Also accepts a (root_name_or_pc, formula_key) tuple. Raises ValueError.
+        """
+        if isinstance(symbol, (tuple, list)):
+            root, key = symbol
+            root_pc = root if isinstance(root, int) else TheoryEngine.note_to_midi(root + "4") % 12
+        else:
+            root = symbol[:2] if symbol[1:2] in ("#", "b") else symbol[:1]
+            if root + "4" not in TheoryEngine.NOTE_TO_MIDI:
+                raise ValueError(f"Unknown chord root in {symbol!r}")
+            root_pc = TheoryEngine.NOTE_TO_MIDI[root + "4"] % 12
+            suffix = symbol[len(root):]
+            key = next((k for s, k in VoiceLeading._SUFFIX_KEYS if s == suffix), None)
+            if key is None:
+                raise ValueError(f"Unknown chord quality in {symbol!r}")
+        if key not in VoiceLeading.formulas():
+            raise ValueError(f"Unknown chord quality {key!r}")
+        return root_pc, key
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def shapes(formula_key):
+        """((shape name, semitones above the root), ...) for one chord quality."""
+        formula = VoiceLeading.formulas()[formula_key]
+        shapes = [("closed", tuple(formula))]
+        # Every inversion: formula[i] in the bass (formulas are in chord-tone
+        # order), the other tones closed up within the octave above it
+        for i in range(1, len(formula)):
+            bass = formula[i] % 12
+            upper = sorted(bass + (s - bass) % 12 for j, s in enumerate(formula) if j != i)
+            shapes.append((f"closed {ChordIdentifier.INVERSIONS[i].split()[0]} inv", (bass,) + tuple(upper)))
+        # Shell: root, 3rd and 7th, picked by interval (chords without both have none)
+        third = next((s for s in formula if s % 12 in (3, 4)), None)
+        seventh = next((s for s in formula if s % 12 in (10, 11)), None)
+        if third is not None and seventh is not None:
+            shapes.append(("shell", (0, third % 12, seventh % 12)))
+        for name, (build, keys) in VoiceLeading.ROOT_SHAPES.items():
+            if formula_key in keys:
+                shapes.append((name, tuple(TheoryEngine.note_to_midi(n) - 60 for n in build("C4"))))
+        return tuple(shapes)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def candidates(root_pc, formula_key, low, high):
+        """Every (shape name, MIDI tuple) for the chord that fits in [low, high]."""
+        out = []
+        for name, offsets in VoiceLeading.shapes(formula_key):
+            bottom, top = min(offsets), max(offsets)
+            # Lowest root (in this pitch class) that keeps the whole shape in range
+            root = low - bottom + (root_pc - (low - bottom)) % 12
+            while root + top <= high:
+                out.append((name, tuple(sorted(root + s for s in offsets))))
+                root += 12
+        return tuple(out)
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def movement(a, b):
+        """Semitones the hand moves from voicing a to voicing b (both sorted)."""
+        if len(a) == len(b):
+            return sum(abs(x - y) for x, y in zip(a, b))
+        # Different voice counts: each note travels to the nearest note of the other chord
+        return (sum(min(abs(x - y) for y in b) for x in a) +
+                sum(min(abs(y - x) for x in a) for y in b)) // 2
+
+    @staticmethod
+    def voice_progression(chords, low=48, high=84, beam=24, start=None):
+        """
+        chords: chord symbols ("Dm7", "G7", ...) or (root, formula_key) tuples.
+        low/high: keyboard range in MIDI numbers.
+        start: optional MIDI voicing to lead from; otherwise the first chord is
+        placed near the middle of the range.
+        Returns ([Voicing per chord], total movement in semitones).
+        """
+        if not chords:
+            return [], 0
+        middle = (low + high) / 2
+
+        # layers[i]: [(cost, back pointer into layers[i-1], shape, midi)]
+        layers = []
+        previous = None
+        for symbol in chords:
+            root_pc, key = VoiceLeading.parse_chord(symbol)
+            options = VoiceLeading.candidates(root_pc, key, low, high)
+            if not options:
+                raise ValueError(f"No voicing of {symbol!r} fits between {low} and {high}")
+            layer = []
+            for shape, midi in options:
+                if previous is None:
+                    # Cost is (movement, distance of the first chord from the middle):
+                    # compared as a tuple, so placement only breaks ties in movement
+                    movement = VoiceLeading.movement(tuple(sorted(start)), midi) if start else 0
+                    layer.append(((movement, abs(sum(midi) / len(midi) - middle)), -1, shape, midi))
+                    continue
+                best_cost, best_j = None, -1
+                for j, (prev_cost, _, _, prev_midi) in enumerate(previous):
+                    cost = (prev_cost[0] + VoiceLeading.movement(prev_midi, midi), prev_cost[1])
+                    if best_cost is None or cost < best_cost:
+                        best_cost, best_j = cost, j
+                layer.append((best_cost, best_j, shape, midi))
+            # Prune to the cheapest paths; back pointers refer to this pruned list
+            layer.sort(key=lambda state: state[0])
+            previous = layer[:beam]
+            layers.append(previous)
+
+        # Walk the back pointers from the cheapest final state
+        path = []
+        j = 0
+        for symbol, layer in zip(reversed(chords), reversed(layers)):
+            _, back, shape, midi = layer[j]
+            path.append(Voicing(symbol if isinstance(symbol, str) else VoiceLeading.chord_symbol(symbol), shape, midi))
+            j = back
+        path.reverse()
+        total = sum(VoiceLeading.movement(a.midi, b.midi) for a, b in zip(path, path[1:]))
+        if start:
+            total += VoiceLeading.movement(tuple(sorted(start)), path[0].midi)
+        return path, total
+
+    @staticmethod
+    def chord_symbol(chord):
+        root_pc, key = VoiceLeading.parse_chord(chord)
+        root = chord[0]
+        spelling = ChordIdentifier.spelling_of(root) if isinstance(root, str) else "sharp"
+        return ChordIdentifier.chord_name(root_pc, key, spelling=spelling)
+
+    @staticmethod
+    def to_names(voicing):
+        return [TheoryEngine.midi_to_note(m) for m in voicing.midi]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Run from anywhere: make murrays_cli and web_app importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,24 @@
+import json
+
+from web_app.app import app
+
+def _records(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+def test_bad_ndjson_lines_get_error_records():
+    body = b'["C4", "E4", "G4"]\n{not json\n\n{"notes": [1]}\n{"notes": ["A3"]}\n'
+    response = app.test_client().post('/api/analyze/batch', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    first, bad_json, bad_notes, last = _records(response)
+    assert first["chord"] == "C"
+    assert bad_json["line"] == 2 and "error" in bad_json
+    assert bad_notes["line"] == 4 and "error" in bad_notes
+    assert last["root"] == "A3"
+
+def test_json_body_must_be_a_list():
+    client = app.test_client()
+    for body in ({"chords": 5}, 3, {"other": []}):
+        assert client.post('/api/analyze/batch', json=body).status_code == 400
+    response = client.post('/api/analyze/batch', json={"chords": [["C4"], 7]})
+    assert response.status_code == 200
+    assert _records(response)[1] == {"error": 'Expected a list of note names or {"notes": [...]}', "index": 1}
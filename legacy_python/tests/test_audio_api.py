@@ -0,0 +1,24 @@
+import os
+
+import web_app.app as web
+from murrays_cli.audio import AudioCache
+
+def test_audio_survives_a_pruned_cache_file(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path))
+    monkeypatch.setattr(web, "audio_cache", cache)
+    client = web.app.test_client()
+    body = {"notes": ["C4", "E4", "G4"], "mode": "chord"}
+    first = client.post('/api/audio', json=body)
+    assert first.status_code == 200 and first.data[:4] == b"RIFF"
+
+    # get() finds the file, then another worker prunes it before it is opened
+    key = AudioCache.make_key(body["notes"], "chord")
+    real_get = cache.get
+    def get_then_prune(k):
+        path = real_get(k)
+        os.unlink(path)
+        return path
+    monkeypatch.setattr(cache, "get", get_then_prune)
+    again = client.post('/api/audio', json=body)
+    assert again.status_code == 200 and again.data == first.data
+    assert os.path.exists(cache.path(key)) # Re-rendered into the cache
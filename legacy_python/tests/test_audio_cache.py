@@ -0,0 +1,17 @@
+import os
+
+from murrays_cli.audio import AudioCache
+
+def test_prunes_least_recently_used_files(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=3000)
+    keys = [AudioCache.make_key([f"C{i}"], "chord") for i in range(5)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, [b"x" * 1000])
+        os.utime(cache.path(key), (i, i)) # Deterministic ages
+    assert cache.get(keys[0]) # Touch: now the most recently used
+
+    cache.put(keys[3], [b"x" * 1000])
+    files, total = cache.scan()
+    assert total <= 3000 * AudioCache.PRUNE_TO
+    assert cache.get(keys[0]) and cache.get(keys[3])
+    assert cache.get(keys[1]) is None
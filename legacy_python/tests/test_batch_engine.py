@@ -0,0 +1,23 @@
+import pytest
+
+from murrays_cli.batch_engine import BatchEngine
+from murrays_cli.theory_engine import TheoryEngine
+
+def test_matches_generate_scale():
+    roots = ["C4", "Bb3", 62, "F#2", 127 - 24]
+    keys = ["Ionian", "Blues", "maj7", "dim", "DiminishedHW"]
+    midi, lengths = BatchEngine.generate(roots, keys)
+    names = BatchEngine.to_names(midi, lengths)
+    for i, root in enumerate(roots):
+        root_name = root if isinstance(root, str) else TheoryEngine.midi_to_note(root)
+        for j, key in enumerate(keys):
+            assert names[i * len(keys) + j] == TheoryEngine.generate_scale(root_name, BatchEngine.get_pattern(key))
+
+def test_mixed_roots_keep_ints():
+    assert BatchEngine.root_array(["C4", 62]).tolist() == [60, 62]
+    assert BatchEngine.root_array([62, "Bb3"]).tolist() == [62, 58]
+
+@pytest.mark.parametrize("roots", [["H4"], ["C4", "X9"], [128], [-1], [True], [None], [60.5]])
+def test_rejects_invalid_roots(roots):
+    with pytest.raises(ValueError):
+        BatchEngine.root_array(roots)
@@ -0,0 +1,24 @@
+import web_app.app as web
+from web_app.app import app
+
+def test_challenge_payloads_are_prebuilt_and_bounded():
+    client = app.test_client()
+    web.warm_challenge_cache()
+    table = web.CHALLENGE_PAYLOADS
+    size = len(table)
+
+    first = client.post('/api/challenge', json={"topic": "Intervals", "challenge_index": 0}).get_json()
+    assert first["instruction"] and first["target_notes"]
+    done = client.post('/api/challenge', json={"topic": "Intervals", "challenge_index": 10**9}).get_json()
+    assert done["no_more_challenges"] is True
+    unknown = client.post('/api/challenge', json={"topic": "No such topic", "challenge_index": 3}).get_json()
+    assert unknown["no_more_challenges"] is False and unknown["target_notes"] == ["C4"]
+    # Unknown keys get shared replies and never enter the table
+    assert web.CHALLENGE_PAYLOADS is table and len(table) == size
+
+def test_challenge_rejects_bad_indexes():
+    client = app.test_client()
+    for index in (-1, "2", 1.5, True):
+        response = client.post('/api/challenge', json={"topic": "Intervals", "challenge_index": index})
+        assert response.status_code == 400, index
+    assert client.post('/api/challenge', json={"topic": ["Intervals"]}).status_code == 400
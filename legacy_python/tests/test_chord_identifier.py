@@ -0,0 +1,25 @@
+from murrays_cli.chord_identifier import ChordIdentifier
+from web_app.app import analyze_notes
+
+def test_flat_spelling():
+    chord = ChordIdentifier.identify([58, 62, 65], "flat")
+    assert chord["chord"] == "Bb"
+    assert ChordIdentifier.chord_name(1, "maj", 8, "flat") == "Db/Ab"
+    assert ChordIdentifier.identify([58, 62, 65])["chord"] == "A#" # Default unchanged
+
+def test_analysis_spells_the_chord_like_its_root():
+    result = analyze_notes(["Bb3", "D4", "F4"])
+    assert (result["chord"], result["root"]) == ("Bb", "Bb3")
+    assert analyze_notes(["D4", "F4", "Bb4"])["chord"] == "Bb/D"
+    assert analyze_notes(["A#3", "D4", "F4"])["chord"] == "A#"
+
+def test_extended_chord_inversions_follow_chord_tones():
+    # 3rd in the bass is 1st inversion; the 9th (a 2nd above the root) doesn't count first
+    c9 = analyze_notes(["E4", "G4", "Bb4", "C5", "D5"])
+    assert (c9["chord"], c9["inversion"]) == ("C9/E", "1st inversion")
+    assert ChordIdentifier.identify([64, 67, 71, 72, 74])["inversion"] == "1st inversion" # Cmaj9/E
+    assert ChordIdentifier.identify([55, 60, 64, 70, 74])["inversion"] == "2nd inversion" # C9/G
+    assert ChordIdentifier.identify([58, 60, 64, 67, 74])["inversion"] == "3rd inversion" # C9/Bb
+    # The 9th in the bass comes after every chord tone
+    assert ChordIdentifier.identify([62, 72, 76, 79])["inversion"] == "3rd inversion" # Cadd9/D
+    assert ChordIdentifier.identify([60, 62, 64, 67])["inversion"] == "root position"
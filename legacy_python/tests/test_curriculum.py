@@ -0,0 +1,15 @@
+from murrays_cli.curriculum import Curriculum
+
+def test_resolved_root_is_written_root():
+    for topic, challenges in Curriculum.CHALLENGES.items():
+        for challenge in challenges:
+            if challenge["type"] == "sequence":
+                continue
+            notes = Curriculum.resolve_target_notes(challenge)
+            assert notes[0] == challenge["root"], (topic, challenge["instruction"], notes)
+
+def test_flat_roots_spell_flats():
+    bb7 = {"type": "triad", "root": "Bb3", "formula_key": "dom7", "instruction": "Play Bb7"}
+    assert Curriculum.resolve_target_notes(bb7) == ["Bb3", "D4", "F4", "Ab4"]
+    minor_third = {"type": "interval", "root": "Eb4", "semitones": 3, "instruction": ""}
+    assert Curriculum.resolve_target_notes(minor_third) == ["Eb4", "Gb4"]
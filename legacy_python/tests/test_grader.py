@@ -0,0 +1,47 @@
+from murrays_cli.curriculum import Curriculum
+from murrays_cli.grader import DrillGrader, GradeSession
+
+def play(target, *events):
+    session = GradeSession(target)
+    grade = None
+    for kind, midi in events:
+        grade = session.event(kind, midi)
+    return grade
+
+def test_ordered_sequence():
+    target = DrillGrader.compile(("C4", "D4", "E4"), ordered=True)
+    grade = play(target, ("on", 60), ("off", 60), ("on", 63), ("on", 62), ("on", 64))
+    assert grade.complete and grade.progress == 3
+    assert grade.error == "D#4" # Wrong notes are reported, not penalised
+    assert not play(target, ("on", 62), ("on", 60), ("on", 64)).complete # Out of order
+
+def test_unordered_chord_any_octave():
+    target = DrillGrader.compile(("C4", "E4", "G4"))
+    assert play(target, ("on", 67), ("on", 72), ("on", 64)).complete
+    grade = play(target, ("on", 60), ("on", 64))
+    assert (grade.progress, grade.total, grade.complete) == (2, 3, False)
+
+def test_voiced_chord_needs_its_bass():
+    target = DrillGrader.compile(("E4", "G4", "C5"), voiced=True)
+    assert play(target, ("on", 64), ("on", 67), ("on", 72)).complete
+    assert not play(target, ("on", 60), ("on", 64), ("on", 67)).complete # Root position
+
+def test_wrong_note():
+    grade = play(DrillGrader.compile(("C4", "E4", "G4")), ("on", 60), ("on", 61))
+    assert grade.wrong == "C#4" and grade.error == "C#4" and not grade.complete
+
+def test_octave_needs_both_keys():
+    octave = next(c for c in Curriculum.CHALLENGES["Intervals"] if c["instruction"] == "Play F Octave")
+    target = DrillGrader.compile_challenge(octave, Curriculum.resolve_target_notes(octave))
+    assert target.total == 2
+    assert not play(target, ("on", 53)).complete
+    assert play(target, ("on", 53), ("on", 65)).complete
+    assert play(target, ("on", 53), ("on", 77)).wrong == "F5"
+
+def test_voicing_flag_comes_from_the_data():
+    for topic, challenges in Curriculum.CHALLENGES.items():
+        for challenge in challenges:
+            if challenge["type"] == "sequence":
+                assert DrillGrader.is_ordered(challenge) == (not challenge.get("voicing")), (topic, challenge)
+    inversion = Curriculum.CHALLENGES["Chord Inversions"][0]
+    assert inversion.get("voicing") is True and not DrillGrader.is_ordered(inversion)
@@ -0,0 +1,41 @@
+from murrays_cli.curriculum import Curriculum
+from web_app.app import LiveSession
+
+def test_bad_frames_get_error_replies():
+    session = LiveSession()
+    for msg in ([1], "on", {"type": "on", "note": "H4"}, {"type": "on", "note": True}, {"type": "on", "note": 200},
+                {"type": "on", "note": [60]}, {"type": "challenge", "topic": 5},
+                {"type": "challenge", "topic": "Intervals", "challenge_index": -1},
+                {"type": "challenge", "topic": "Intervals", "challenge_index": "0"},
+                {"type": "challenge", "topic": "No such topic"},
+                {"type": "challenge", "topic": "Intervals", "challenge_index": 10**6},
+                {"type": "dance"}):
+        replies = session.handle(msg)
+        assert [r["type"] for r in replies] == ["error"], msg
+    assert session.grader is None
+
+def test_analysis_replies():
+    session = LiveSession()
+    session.handle({"type": "on", "note": "C4"})
+    session.handle({"type": "on", "note": 64})
+    (analysis,) = session.handle({"type": "on", "note": "G4"})
+    assert analysis["type"] == "analysis" and analysis["chord"] == "C"
+    assert "key" in analysis
+    (analysis,) = session.handle({"type": "off", "note": 67})
+    assert analysis["sorted_notes"] == ["C4", "E4"]
+
+def test_grades_a_loaded_challenge():
+    session = LiveSession()
+    (challenge,) = session.handle({"type": "challenge", "topic": "Intervals", "challenge_index": 0}) # C4 E4
+    assert challenge["type"] == "challenge" and challenge["ordered"] is False
+    _, grade = session.handle({"type": "on", "note": "C4"})
+    assert (grade["progress"], grade["complete"]) == (1, False)
+    _, grade = session.handle({"type": "on", "note": "D4"})
+    assert grade["wrong_note"] == "D4"
+    session.handle({"type": "off", "note": "D4"})
+    _, grade = session.handle({"type": "on", "note": "E4"})
+    assert grade["complete"] and grade["first_error"] == "D4"
+
+    done = len(Curriculum.CHALLENGES["Intervals"])
+    (reply,) = session.handle({"type": "challenge", "topic": "Intervals", "challenge_index": done})
+    assert reply["no_more_challenges"] is True and session.grader is None
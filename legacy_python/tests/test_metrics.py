@@ -0,0 +1,47 @@
+import multiprocessing
+
+import pytest
+from flask import Flask
+
+from web_app.metrics import Metrics
+
+def _worker(directory):
+    worker = Metrics(directory=directory)
+    worker.observe_request("/api/analyze", "POST", 200, 0.002, 100)
+    worker.observe_stage("svg_render", 0.01)
+    worker.flush()
+
+def test_scrape_adds_up_all_workers(tmp_path):
+    for _ in range(2):
+        p = multiprocessing.get_context("fork").Process(target=_worker, args=(str(tmp_path),))
+        p.start()
+        p.join()
+    scraper = Metrics(directory=str(tmp_path))
+    scraper.observe_request("/api/analyze", "POST", 200, 0.002, 100)
+
+    text = scraper.render()
+    assert 'murray_requests_total{route="/api/analyze",method="POST",status="200"} 3' in text
+    assert 'murray_stage_duration_seconds_count{stage="svg_render"} 2' in text
+
+    scraper.clear()
+    scraper.reset()
+    assert "murray_requests_total{" not in scraper.render()
+
+def test_records_unhandled_errors_and_skips_paused_work():
+    app = Flask(__name__)
+    app.testing = True # Exceptions propagate, so only teardown_request sees the request
+    metrics = Metrics()
+    metrics.init_app(app)
+
+    @app.route("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/boom")
+    assert 'murray_requests_total{route="/boom",method="GET",status="500"} 1' in metrics.render()
+
+    with metrics.pause():
+        with metrics.stage("svg_render"):
+            pass
+    assert 'stage="svg_render"' not in metrics.render()
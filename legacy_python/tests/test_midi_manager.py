@@ -0,0 +1,31 @@
+import threading
+from collections import namedtuple
+
+from murrays_cli.midi_manager import MidiManager
+
+Message = namedtuple("Message", ["type", "note", "velocity"])
+
+def test_failing_snapshot_callback_keeps_flushing(capsys):
+    delivered = []
+    first, second = threading.Event(), threading.Event()
+
+    def on_snapshot(snapshot):
+        delivered.append(snapshot.active)
+        if len(delivered) == 1:
+            first.set()
+            raise RuntimeError("display broke")
+        second.set()
+
+    manager = MidiManager(coalesce_window=0.005, snapshot_callback=on_snapshot)
+    # start() without a port: just the flush thread
+    manager.flush_thread = threading.Thread(target=manager._flush_loop, daemon=True)
+    manager.flush_thread.start()
+    try:
+        manager._on_message(Message("note_on", 60, 90))
+        assert first.wait(2)
+        manager._on_message(Message("note_on", 64, 90))
+        assert second.wait(2), "flush thread died after the callback raised"
+    finally:
+        manager.stop()
+    assert delivered == [(60,), (60, 64)]
+    assert "display broke" in capsys.readouterr().out
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from murrays_cli.progress_store import ProgressStore, Attempt
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.db"), flush_interval=0.05)
+    yield store
+    store.close()
+
+def test_batched_attempts_advance_progress(store):
+    for i in range(3):
+        store.record_attempt("ann", "Intervals", i, True, 900)
+    store.record_attempt("ann", "Intervals", 3, False)
+    store.flush()
+    assert store.next_challenge("ann", "Intervals") == 3
+    stats = store.topic_stats("Intervals", "ann")
+    assert stats["attempts"] == 4 and stats["passed"] == 3
+
+@pytest.mark.parametrize("fields", [
+    (["bad"], "Intervals", 0, True, None),
+    ("ann", "Intervals", "0", True, None),
+    ("ann", "Intervals", 0, 1, None),
+    ("ann", "Intervals", 0, True, {"ms": 5}),
+])
+def test_record_attempt_rejects_bad_types(store, fields):
+    with pytest.raises(TypeError):
+        store.record_attempt(*fields)
+
+def test_bad_row_does_not_lose_the_batch(store):
+    store.record_attempt("ann", "Intervals", 0, True)
+    store.flush()
+    # Rows that slipped past validation: unhashable student, unbindable duration
+    store._queue.put(Attempt(["bad"], "Intervals", 0, True, None, time.time()))
+    store._queue.put(Attempt("bob", "Intervals", 0, False, {"ms": 5}, time.time()))
+    for i in range(5):
+        store.record_attempt("cat", "Intervals", i, True, 100)
+    store.flush()
+
+    assert store._writer.is_alive()
+    assert store.topic_stats("Intervals", "cat")["attempts"] == 5
+    assert store.next_challenge("cat", "Intervals") == 5
+
+    store.record_attempt("dan", "Intervals", 0, True)
+    store.flush()
+    assert store.next_challenge("dan", "Intervals") == 1
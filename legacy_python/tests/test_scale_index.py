@@ -0,0 +1,24 @@
+import random
+
+from murrays_cli.scale_index import ScaleIndex
+
+def test_bass_root_ranks_first_within_a_size():
+    mask = ScaleIndex.pitch_class_mask(["A3", "C4", "E4"])
+    names = lambda ranked: [(r, ScaleIndex.MODE_NAMES[m]) for r, m in ranked]
+    # Smallest scales first; without a bass, MODES order decides
+    assert names(ScaleIndex.lookup(mask))[:2] == [(0, "PentMajor"), (9, "PentMinor")]
+    assert names(ScaleIndex.lookup(mask, bass_pc=9))[:2] == [(9, "PentMinor"), (0, "PentMajor")]
+    top = ScaleIndex.scales_containing(["A3", "C4", "E4"], limit=1)
+    assert top[0]["scale"] == "A PentMinor"
+
+def test_ranking_matches_full_sort():
+    rng = random.Random(3)
+    sizes = ScaleIndex.MODE_SIZES
+    for _ in range(200):
+        mask = rng.randrange(1, 4096)
+        bass = rng.randrange(12)
+        expected = sorted(ScaleIndex.TABLE[mask], key=lambda m: (sizes[m[1]], m[0] != bass))
+        assert list(ScaleIndex.lookup(mask, bass)) == expected
+        assert ScaleIndex.lookup(mask, bass) is ScaleIndex.lookup(mask, bass) # Kept, not re-sorted
+        ranks = [sizes[m] for _, m in ScaleIndex.lookup(mask)]
+        assert ranks == sorted(ranks)
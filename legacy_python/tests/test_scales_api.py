@@ -0,0 +1,9 @@
+from web_app.app import app
+
+def test_scales_rejects_bad_limit_and_notes():
+    client = app.test_client()
+    for body in ({"notes": ["C4", "E4"], "limit": "3"}, {"notes": ["C4"], "limit": 0},
+                 {"notes": [["C4"]]}, {"notes": [{"n": 1}]}, {"notes": "C4"}):
+        assert client.post('/api/scales', json=body).status_code == 400
+    response = client.post('/api/scales', json={"notes": ["C4", "E4", 67], "limit": 2})
+    assert response.status_code == 200 and len(response.get_json()["matches"]) == 2
@@ -0,0 +1,13 @@
+from web_app.app import app
+
+def test_score_rejects_bad_input_before_streaming():
+    client = app.test_client()
+    for body in ({"notes": ["C4"], "notes_per_measure": 0}, {"notes": ["C4"], "notes_per_measure": -2},
+                 {"notes": ["C4"], "width": "abc"}, {"notes": ["C4", "H4"]}, {"notes": [["C4"]]}, {"notes": "C4"}):
+        assert client.post('/api/generate-score', json=body).status_code == 400, body
+
+def test_score_streams_complete_svg():
+    response = app.test_client().post('/api/generate-score', json={"notes": ["C4", "Bb4", "F#5"] * 5, "notes_per_measure": 3})
+    assert response.status_code == 200
+    svg = response.data.decode()
+    assert svg.startswith("<svg") and svg.endswith("</svg>")
@@ -0,0 +1,55 @@
+import random
+from itertools import product
+
+from murrays_cli.voice_leading import VoiceLeading
+
+def brute_force_movement(chords, low, high):
+    options = [[midi for _, midi in VoiceLeading.candidates(*VoiceLeading.parse_chord(c), low, high)]
+               for c in chords]
+    return min(sum(VoiceLeading.movement(a, b) for a, b in zip(path, path[1:]))
+               for path in product(*options))
+
+def test_reported_case_is_optimal():
+    chords = ['Fmaj7', 'A7', 'Bbmaj7', 'Db']
+    _, total = VoiceLeading.voice_progression(chords, beam=10**6)
+    assert total == brute_force_movement(chords, 48, 84)
+
+def test_matches_brute_force_on_random_progressions():
+    rng = random.Random(7)
+    symbols = [root + quality for root in ("C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+               for quality in ("", "m", "7", "maj7", "m7", "dim")]
+    for _ in range(40):
+        chords = [rng.choice(symbols) for _ in range(3)]
+        path, total = VoiceLeading.voice_progression(chords, low=55, high=79, beam=10**6)
+        assert len(path) == len(chords)
+        assert total == brute_force_movement(chords, 55, 79), chords
+
+def test_total_matches_returned_path():
+    path, total = VoiceLeading.voice_progression(["Dm7", "G7", "Cmaj7"], start=[60, 64, 67])
+    moves = [VoiceLeading.movement((60, 64, 67), path[0].midi)]
+    moves += [VoiceLeading.movement(a.midi, b.midi) for a, b in zip(path, path[1:])]
+    assert total == sum(moves)
+
+def test_shapes_voice_the_right_tones():
+    names = lambda key: dict(VoiceLeading.shapes(key))
+    # Shells are root, 3rd and 7th, also for 9th chords
+    assert names("min9")["shell"] == (0, 3, 10)
+    assert names("maj9")["shell"] == (0, 4, 11)
+    assert names("dom7b9")["shell"] == (0, 4, 10)
+    assert "shell" not in names("add9") and "shell" not in names("6/9")
+    # Each inversion puts its chord tone in the bass and keeps every pitch class
+    for key in ("maj", "dom7", "dom9", "maj9", "min9", "add9", "6/9"):
+        formula = VoiceLeading.formulas()[key]
+        closed = [offsets for name, offsets in VoiceLeading.shapes(key) if name.startswith("closed")]
+        assert len(closed) == len(formula)
+        for i, offsets in enumerate(closed):
+            assert min(offsets) % 12 == formula[i] % 12, (key, i, offsets)
+            assert {s % 12 for s in offsets} == {s % 12 for s in formula}
+
+def test_dm9_and_cmaj9_shell_voicings():
+    shells = lambda symbol: [midi for name, midi in VoiceLeading.candidates(*VoiceLeading.parse_chord(symbol), 48, 72)
+                             if name == "shell"]
+    assert shells("Dm9")[0] == (50, 53, 60) # D F C
+    assert shells("Cmaj9")[0] == (48, 52, 59) # C E B
+    cmaj9 = dict(VoiceLeading.candidates(0, "maj9", 48, 72))
+    assert cmaj9["closed"] == (48, 52, 55, 59, 62) # C E G B D
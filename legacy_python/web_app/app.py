@@ -3,13 +3,31 @@ import sys
 # Add parent directory to path so we can import murrays_cli
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from flask import Flask, render_template, request, jsonify, make_response
+from flask import Flask, Response, render_template, request, jsonify, make_response, stream_with_context, send_file
+from flask_sock import Sock
 from murrays_cli.theory_engine import TheoryEngine
 from murrays_cli.curriculum import Curriculum
-from murrays_cli.sheet_music import SheetMusicGenerator
+from murrays_cli.sheet_music import SheetMusicGenerator, ScoreLayout
+from murrays_cli.chord_identifier import ChordIdentifier
+from murrays_cli.scale_index import ScaleIndex
+from murrays_cli.pc_sets import PitchClassSets
+from murrays_cli.grader import DrillGrader, GradeSession
+from murrays_cli.key_detection import KeyDetector
+from murrays_cli import audio
+from murrays_cli.progress_store import ProgressStore, DEFAULT_PATH
+from web_app.metrics import metrics
 import random
+import io
+import json
+import time
+import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
 
 app = Flask(__name__)
+sock = Sock(app)
+metrics.init_app(app)
 
 @app.route('/')
 def index():
@@ -23,103 +41,486 @@ def get_curriculum():
         "descriptions": Curriculum.DESCRIPTIONS
     })
 
-@app.route('/api/analyze', methods=['POST'])
-def analyze():
-    data = request.json
-    notes = data.get('notes', [])
-    
+def analyze_notes(notes):
+    """Chord/interval analysis for a list of note names. Shared by the analyze routes."""
     if not notes:
-        return jsonify({"info": "No notes detected.", "root": "-", "intervals": [], "sorted_notes": []})
+        return {"info": "No notes detected.", "root": "-", "intervals": [], "sorted_notes": []}
 
     # Sort notes by midi value
-    sorted_notes = sorted(notes, key=lambda n: TheoryEngine.note_to_midi(n))
-    root = sorted_notes[0]
-    
+    with metrics.stage("note_parse"):
+        midis = [TheoryEngine.note_to_midi(n) for n in notes]
+    order = sorted(range(len(notes)), key=midis.__getitem__)
+    sorted_notes = [notes[i] for i in order]
+
+    chord = ChordIdentifier.identify(midis)
+    if chord:
+        # Root is the lowest played note carrying the chord's root pitch class
+        root_idx = next(i for i in order if midis[i] % 12 == chord["root_pc"])
+        # Name the chord the way its root was written (Bb3 -> "Bb", not "A#")
+        spelling = ChordIdentifier.spelling_of(notes[root_idx])
+        if spelling != "sharp":
+            chord = ChordIdentifier.identify(midis, spelling)
+    else:
+        root_idx = order[0]
+    root = notes[root_idx]
+    root_midi = midis[root_idx]
+
     # Identify intervals relative to root
-    intervals = []
-    root_midi = TheoryEngine.note_to_midi(root)
-    
-    for n in sorted_notes:
-        m = TheoryEngine.note_to_midi(n)
-        semitones = m - root_midi
-        int_name = "?"
-        for k, v in TheoryEngine.INTERVALS.items():
-            if v == semitones % 12: 
-                int_name = k
-                break
-        intervals.append(f"{n} ({int_name})")
+    intervals = [f"{notes[i]} ({TheoryEngine.INTERVAL_NAMES[(midis[i] - root_midi) % 12]})" for i in order]
 
-    return jsonify({
+    return {
         "root": root,
         "intervals": intervals,
-        "sorted_notes": sorted_notes
-    })
+        "sorted_notes": sorted_notes,
+        "chord": chord["chord"] if chord else None,
+        "inversion": chord["inversion"] if chord else None,
+        "alternatives": chord["alternatives"] if chord else [],
+        # normal_form, prime_form, forte, interval_vector
+        "pc_set": PitchClassSets.describe(ChordIdentifier.pitch_class_mask(midis)),
+    }
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze():
+    data = request.json
+    result = analyze_notes(data.get('notes', []))
+    with metrics.stage("json_serialize"):
+        return jsonify(result)
+
+@app.route('/api/scales', methods=['POST'])
+def scales():
+    """Scales/modes containing every played note, best fit first."""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    notes = data.get('notes', [])
+    if not isinstance(notes, list):
+        return jsonify({"error": "notes must be a list of note names or MIDI numbers"}), 400
+    # Names are checked by string type first: lists/dicts in the list aren't hashable
+    unknown = [n for n in notes if not (isinstance(n, str) and n in TheoryEngine.NOTE_TO_MIDI or
+                                        isinstance(n, int) and not isinstance(n, bool) and 0 <= n < 128)]
+    if unknown:
+        return jsonify({"error": f"Unknown notes: {', '.join(map(str, unknown))}"}), 400
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    spelling = data.get('spelling', 'sharp')
+    if spelling not in ('sharp', 'flat'):
+        return jsonify({"error": 'spelling must be "sharp" or "flat"'}), 400
+    matches = ScaleIndex.scales_containing(notes, limit, spelling)
+    return jsonify({"notes": notes, "matches": matches})
+
+class SvgCache:
+    """
+    Content-addressed store for rendered sheet music.
+    Key = SHA-256 of the canonical JSON of (notes, render options); the same
+    hash doubles as the strong ETag. Least recently used entries are evicted
+    once the stored SVG exceeds max_bytes.
+    """
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict() # key -> svg bytes
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(notes, options=None):
+        canonical = json.dumps({"notes": notes, "options": options or {}}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            svg = self.entries.get(key)
+            if svg is not None:
+                self.entries.move_to_end(key)
+            return svg
+
+    def put(self, key, svg):
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = svg
+            self.total_bytes += len(svg)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, old = self.entries.popitem(last=False)
+                self.total_bytes -= len(old)
+
+svg_cache = SvgCache(int(os.environ.get("SVG_CACHE_BYTES", str(8 * 1024 * 1024))))
+
+# Attempts are queued and written in batches by each worker's writer thread
+progress_store = ProgressStore(DEFAULT_PATH)
+
+def _ndjson_note_sets(stream):
+    # One note set per line: ["C4", "E4"] or {"notes": ["C4", "E4"]}.
+    # Yields (line number, note set); a line that isn't JSON yields its error instead.
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+
+def _batch_notes(item):
+    """Note list from one batch input, or raises ValueError."""
+    if isinstance(item, Exception):
+        raise item
+    notes = item.get('notes', []) if isinstance(item, dict) else item
+    if not isinstance(notes, list) or not all(isinstance(n, str) for n in notes):
+        raise ValueError("Expected a list of note names or {\"notes\": [...]}")
+    return notes
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Many analyses per request. Body is either JSON ({"chords": [[...], ...]} or a
+    bare list of note lists) or NDJSON (application/x-ndjson, one set per line).
+    Replies with NDJSON, one analyze_notes() result per input, streamed in order.
+    A bad input gets {"error": ..., "line": n} (NDJSON, from 1) or
+    {"error": ..., "index": n} (JSON, from 0) in its place; the rest still run.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonlines'):
+        field, note_sets = "line", _ndjson_note_sets(request.stream)
+    else:
+        # Checked here: once streaming starts the status is already 200
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('chords')
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a JSON list of note lists or {\"chords\": [...]}"}), 400
+        field, note_sets = "index", enumerate(data)
+
+    def generate():
+        for position, item in note_sets:
+            try:
+                result = analyze_notes(_batch_notes(item))
+            except ValueError as e:
+                result = {"error": str(e), field: position}
+            yield app.json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 @app.route('/api/generate-sheet', methods=['POST'])
 def generate_sheet():
     data = request.json
     notes = data.get('notes', [])
-    
-    # Generate SVG String
-    svg_data = SheetMusicGenerator.generate_svg(notes)
-    
-    response = make_response(svg_data)
+
+    key = SvgCache.make_key(notes, {"renderer": SheetMusicGenerator.VERSION})
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    # Same notes -> same SVG, so a matching ETag means the client copy is current
+    if request.if_none_match.contains_weak(key):
+        return make_response("", 304, headers)
+
+    svg_data = svg_cache.get(key)
+    if svg_data is None:
+        # Generate SVG String
+        with metrics.stage("svg_render"):
+            svg_data = SheetMusicGenerator.generate_svg(notes).encode()
+        svg_cache.put(key, svg_data)
+
+    response = make_response(svg_data, 200, headers)
     response.content_type = 'image/svg+xml'
     return response
 
-@app.route('/api/challenge', methods=['POST'])
-def get_challenge():
-    data = request.json
-    topic = data.get('topic')
-    challenge_index = data.get('challenge_index', 0)
-    
-    # Check if topic exists in challenges
-    if topic not in Curriculum.CHALLENGES or not Curriculum.CHALLENGES[topic]:
-        # Fallback for empty/missing topics to prevent crash
-        return jsonify({
-            "instruction": f"Topic: {topic}",
+@app.route('/api/generate-score', methods=['POST'])
+def generate_score():
+    """Long passages: multi-system layout, streamed measure by measure."""
+    # Checked here: once streaming starts the status is already 200
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    notes = data.get('notes', [])
+    if not isinstance(notes, list):
+        return jsonify({"error": "notes must be a list of note names"}), 400
+    unknown = [n for n in notes if not (isinstance(n, str) and n in TheoryEngine.NOTE_TO_MIDI)]
+    if unknown:
+        return jsonify({"error": f"Unknown notes: {', '.join(map(str, unknown))}"}), 400
+    options = {name: data.get(name, default) for name, default in (('width', 800), ('notes_per_measure', 4))}
+    for name, value in options.items():
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return jsonify({"error": f"{name} must be a positive integer"}), 400
+    layout = ScoreLayout(**options)
+    return Response(stream_with_context(layout.iter_svg(notes)), mimetype='image/svg+xml')
+
+# Shared with the CLI drill
+resolve_target_notes = Curriculum.resolve_target_notes
+
+# A challenge response depends only on (topic, index), so every curriculum
+# challenge is serialized once into a plain dict. Keys that aren't in the
+# curriculum get one of the shared replies below and are never stored, so
+# clients can't grow the table or push the warmed entries out.
+CHALLENGE_PAYLOADS = {}
+UNKNOWN_TOPIC_PAYLOAD = None # Built with the table (needs the SVG renderer)
+COMPLETED_PAYLOAD = app.json.dumps({"no_more_challenges": True,
+                                "message": "You've completed all challenges for this section! Time to move on."}).encode()
+
+def build_challenge_payload(topic, challenge_index):
+    """Ready-to-send JSON bytes for one curriculum challenge."""
+    challenge_data = Curriculum.CHALLENGES[topic][challenge_index]
+    target_notes = resolve_target_notes(challenge_data)
+
+    with metrics.stage("svg_render"):
+        svg_data = SheetMusicGenerator.generate_svg(target_notes)
+
+    body = {
+        "instruction": challenge_data["instruction"],
+        "context": challenge_data.get("context", ""),
+        "target_notes": target_notes,
+        "svg": svg_data
+    }
+    with metrics.stage("json_serialize"):
+        return app.json.dumps(body).encode()
+
+def warm_challenge_cache():
+    """
+    Builds CHALLENGE_PAYLOADS. Call before forking workers (see gunicorn.conf.py)
+    so they all share it; otherwise the first /api/challenge builds it. Stage
+    timings are not recorded: they would be copied into every forked worker.
+    """
+    global CHALLENGE_PAYLOADS, UNKNOWN_TOPIC_PAYLOAD
+    payloads = {}
+    with metrics.pause():
+        for topic, challenges in Curriculum.CHALLENGES.items():
+            for i in range(len(challenges)):
+                payloads[(topic, i)] = build_challenge_payload(topic, i)
+        # Fallback for topics without content, so the page still has a staff to show
+        UNKNOWN_TOPIC_PAYLOAD = app.json.dumps({
+            "instruction": "Unknown topic",
             "context": "Content coming soon.",
             "target_notes": ["C4"], # Dummy note
             "svg": SheetMusicGenerator.generate_svg(["C4"]),
             "no_more_challenges": False
-        })
-
-    challenges_for_topic = Curriculum.CHALLENGES[topic]
-    
-    if challenge_index >= len(challenges_for_topic):
-        return jsonify({"no_more_challenges": True, "message": "You've completed all challenges for this section! Time to move on."})
-
-    challenge_data = challenges_for_topic[challenge_index]
-    
-    target_notes = []
-    instruction = challenge_data["instruction"]
-    context_info = challenge_data.get("context", "")
-    
-    if challenge_data["type"] == "triad":
-        root = challenge_data["root"]
-        formula_key = challenge_data["formula_key"]
-        formula = TheoryEngine.TRIAD_FORMULAS.get(formula_key)
-        if formula:
-            target_notes = TheoryEngine.generate_scale(root, formula)
-        else:
-            target_notes = [root] # Fallback
-    elif challenge_data["type"] == "interval":
-        root = challenge_data["root"]
-        semitones = challenge_data["semitones"]
-        n2 = TheoryEngine.get_note_from_interval(root, semitones)
-        target_notes = [root, n2]
-    elif challenge_data["type"] == "sequence":
-        target_notes = challenge_data["notes"] # Directly provide notes for sequences
-    
-    # Generate SVG for the target
-    svg_data = SheetMusicGenerator.generate_svg(target_notes)
-    
-    return jsonify({
-        "instruction": instruction,
-        "context": context_info,
-        "target_notes": target_notes,
-        "svg": svg_data
-    })
+        }).encode()
+    CHALLENGE_PAYLOADS = payloads # Swapped in whole, so readers never see it half built
+    return len(payloads)
+
+def challenge_payload(topic, challenge_index):
+    """JSON bytes for /api/challenge; challenge_index is a non-negative int."""
+    if not CHALLENGE_PAYLOADS:
+        warm_challenge_cache()
+    payload = CHALLENGE_PAYLOADS.get((topic, challenge_index))
+    if payload is not None:
+        return payload
+    if not Curriculum.CHALLENGES.get(topic):
+        return UNKNOWN_TOPIC_PAYLOAD
+    return COMPLETED_PAYLOAD
+
+# Rendered WAVs, shared by all workers through the filesystem
+audio_cache = audio.AudioCache(os.environ.get("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "murray-audio")),
+                               int(os.environ.get("AUDIO_CACHE_BYTES", str(256 * 1024 * 1024))))
+# Longest note list rendered per request (a sequence is ~0.45 s of audio per note)
+AUDIO_MAX_NOTES = int(os.environ.get("AUDIO_MAX_NOTES", "64"))
+
+def open_cached_audio(path):
+    """The cached WAV opened for reading, or None if missing (or pruned meanwhile)."""
+    if path is None:
+        return None
+    try:
+        return open(path, 'rb')
+    except OSError:
+        return None
+
+@app.route('/api/audio', methods=['POST'])
+def get_audio():
+    """
+    WAV of a note list ({"notes": [...], "mode": "chord" | "sequence"}) or of a
+    challenge's target ({"topic": ..., "challenge_index": ...}).
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    if 'topic' in data:
+        if not isinstance(data['topic'], str):
+            return jsonify({"error": "topic must be a string"}), 400
+        challenges = Curriculum.CHALLENGES.get(data['topic']) or []
+        index = data.get('challenge_index', 0)
+        if not isinstance(index, int) or not 0 <= index < len(challenges):
+            return jsonify({"error": "No such challenge"}), 404
+        challenge = challenges[index]
+        notes = resolve_target_notes(challenge)
+        mode = "sequence" if DrillGrader.is_ordered(challenge) else "chord"
+    else:
+        notes = data.get('notes', [])
+        if not isinstance(notes, list):
+            return jsonify({"error": "notes must be a list"}), 400
+        mode = data.get('mode') or audio.default_mode(notes)
+    if len(notes) > AUDIO_MAX_NOTES:
+        return jsonify({"error": f"At most {AUDIO_MAX_NOTES} notes per request"}), 400
+    unknown = [n for n in notes if not isinstance(n, str) or n not in TheoryEngine.NOTE_TO_MIDI]
+    if not notes or unknown or mode not in ("chord", "sequence"):
+        return jsonify({"error": "Expected known notes and mode chord|sequence"}), 400
+
+    key = audio.AudioCache.make_key(notes, mode)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "no-cache"}
+    if request.if_none_match.contains_weak(key):
+        return make_response("", 304, headers)
+
+    # Open the file before responding: another worker may prune it at any
+    # time, but an open file stays readable after it is deleted
+    wav = open_cached_audio(audio_cache.get(key))
+    if wav is None:
+        with metrics.stage("audio_render"):
+            samples = audio.render(notes, mode)
+        wav = open_cached_audio(audio_cache.put(key, audio.iter_wav(samples)))
+        if wav is None:
+            wav = io.BytesIO(b"".join(audio.iter_wav(samples))) # Pruned straight away
+    # send_file streams the file in blocks rather than loading it
+    response = send_file(wav, mimetype='audio/wav', conditional=False, etag=False)
+    response.headers.update(headers)
+    return response
+
+@app.route('/api/challenge', methods=['POST'])
+def get_challenge():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('topic'), str):
+        return jsonify({"error": "Expected a JSON object with a topic string"}), 400
+    challenge_index = data.get('challenge_index')
+    if challenge_index is None:
+        # Resume from the server-side progress when the client only says who it is
+        student = data.get('student')
+        challenge_index = progress_store.next_challenge(student, data.get('topic')) if student else 0
+    if not isinstance(challenge_index, int) or isinstance(challenge_index, bool) or challenge_index < 0:
+        return jsonify({"error": "challenge_index must be a non-negative int"}), 400
+    payload = challenge_payload(data.get('topic'), challenge_index)
+    return app.response_class(payload, mimetype='application/json')
+
+@app.route('/api/attempt', methods=['POST'])
+def record_attempt():
+    data = request.get_json(silent=True)
+    try:
+        progress_store.record_attempt(data['student'], data['topic'], data['challenge_index'],
+                                      data['correct'], data.get('duration_ms'))
+    except (KeyError, TypeError, AttributeError):
+        return jsonify({"error": "Expected student and topic (str), challenge_index (int), "
+                                 "correct (bool) and optional duration_ms (int)"}), 400
+    return jsonify({"queued": True}), 202
+
+@app.route('/api/progress')
+def get_progress():
+    student = request.args.get('student')
+    topic = request.args.get('topic')
+    if topic:
+        stats = progress_store.topic_stats(topic, student)
+        if student:
+            stats["next_index"] = progress_store.next_challenge(student, topic)
+        return jsonify(stats)
+    if not student:
+        return jsonify({"error": "Provide student and/or topic"}), 400
+    return jsonify({"student": student, "topics": progress_store.progress(student)})
+
+class LiveSession:
+    """
+    State of one /ws/live connection: the notes currently held and the
+    challenge being graded. handle() takes one client message and returns
+    the replies to push back.
+
+    Client -> server:
+      {"type": "on" | "off", "note": 60 | "C4"}
+      {"type": "challenge", "topic": "...", "challenge_index": 0}
+      {"type": "reset"}
+    Server -> client: "analysis" (analyze_notes fields + running "key"), "challenge"
+    (/api/challenge fields, plus "ordered" once a target is loaded), "grade", "error".
+    Unknown topics and indexes past the "completed" reply are errors.
+    """
+    def __init__(self):
+        self.active = set() # MIDI numbers
+        self.grader = None # GradeSession for the loaded challenge
+        self.key = KeyDetector(half_life=8.0)
+
+    def handle(self, msg):
+        # Frames come straight from clients: check shapes/types, never raise
+        if not isinstance(msg, dict):
+            return [{"type": "error", "message": "Expected a JSON object"}]
+        kind = msg.get('type')
+        if kind in ('on', 'off'):
+            note = msg.get('note')
+            if isinstance(note, int) and not isinstance(note, bool):
+                m = note
+            else:
+                m = TheoryEngine.NOTE_TO_MIDI.get(note) if isinstance(note, str) else None
+            if m is None or not 0 <= m < 128:
+                return [{"type": "error", "message": f"Unknown note: {note}"}]
+            if kind == 'on':
+                self.active.add(m)
+                self.key.note_on(m, time.monotonic())
+            else:
+                self.active.discard(m)
+            names = [TheoryEngine.midi_to_note(n) for n in sorted(self.active)]
+            replies = [dict(analyze_notes(names), type="analysis")]
+            key = self.key.estimate()
+            replies[0]["key"] = {"name": key.name, "correlation": key.correlation} if key else None
+            if self.grader is not None:
+                replies.append(self.grade(self.grader.event(kind, m)))
+            return replies
+        if kind == 'challenge':
+            topic = msg.get('topic')
+            index = msg.get('challenge_index', 0)
+            if not isinstance(topic, str):
+                return [{"type": "error", "message": "topic must be a string"}]
+            if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+                return [{"type": "error", "message": "challenge_index must be a non-negative int"}]
+            if not Curriculum.CHALLENGES.get(topic):
+                return [{"type": "error", "message": f"Unknown topic: {topic}"}]
+            # One past the last challenge is the "completed" reply; beyond that is a client bug
+            if index > len(Curriculum.CHALLENGES[topic]):
+                return [{"type": "error", "message": f"No challenge {index} in {topic}"}]
+            return [self.load_challenge(topic, index)]
+        if kind == 'reset':
+            self.active.clear()
+            self.key.reset()
+            if self.grader is not None:
+                self.grader.reset()
+            return []
+        return [{"type": "error", "message": f"Unknown message type: {kind}"}]
+
+    def load_challenge(self, topic, challenge_index):
+        """topic is known and challenge_index at most one past its last challenge."""
+        payload = json.loads(challenge_payload(topic, challenge_index))
+        self.grader = None
+        if "target_notes" in payload:
+            challenge = Curriculum.CHALLENGES[topic][challenge_index]
+            target = DrillGrader.compile_challenge(challenge, payload["target_notes"])
+            self.grader = GradeSession(target)
+            payload["ordered"] = target.ordered
+            # Notes already held count towards a chord, not a sequence
+            if not target.ordered:
+                for m in sorted(self.active):
+                    self.grader.event('on', m)
+        payload["type"] = "challenge"
+        return payload
+
+    @staticmethod
+    def grade(result):
+        reply = {"type": "grade", "progress": result.progress, "total": result.total, "complete": result.complete}
+        if result.wrong:
+            reply["wrong_note"] = result.wrong
+        if result.error:
+            reply["first_error"] = result.error
+        return reply
+
+@sock.route('/ws/live')
+def live(ws):
+    """Live analysis/grading over one WebSocket; JSON text frames both ways."""
+    session = LiveSession()
+    while True:
+        raw = ws.receive()
+        if raw is None:
+            break
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            ws.send(app.json.dumps({"type": "error", "message": "Invalid JSON"}))
+            continue
+        try:
+            replies = session.handle(msg)
+        except Exception:
+            # A bug in one handler shouldn't drop the student's connection
+            app.logger.exception("live: failed to handle %r", msg)
+            replies = [{"type": "error", "message": "Internal error"}]
+        for reply in replies:
+            ws.send(app.json.dumps(reply))
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
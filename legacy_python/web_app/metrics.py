@@ -0,0 +1,259 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+# Upper bounds (Prometheus "le") for latency in seconds and payload size in bytes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{_labels(**labels, le=f"{bound:g}")} {cumulative}')
+        lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {self.count}')
+        lines.append(f'{name}_sum{_labels(**labels)} {self.sum:.6f}')
+        lines.append(f'{name}_count{_labels(**labels)} {self.count}')
+        return lines
+
+class Metrics:
+    """
+    Request metrics exposed in Prometheus text format.
+
+    Under gunicorn every worker counts in its own memory. With a `directory`
+    (METRICS_DIR; gunicorn.conf.py sets one) each worker also writes its
+    numbers to its own file in the directory about once a second, and a scrape,
+    whichever worker serves it, adds up all the files. Files of exited
+    workers are kept so counters never go backwards; clear() empties the
+    directory when the server starts.
+    """
+    FLUSH_SECONDS = 1.0
+
+    def __init__(self, prefix="murray", directory=None):
+        self.prefix = prefix
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.paused = False
+        self.flusher_pid = None # Process the flush thread was started in
+        self.file = None # (pid, file name); a new worker reusing a pid still gets its own file
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = Counter() # (route, method, status) -> count
+            self.latency = {} # (route, method) -> Histogram
+            self.sizes = {} # (route, method) -> Histogram
+            self.stages = {} # stage name -> Histogram
+            self.dirty = False
+
+    @contextmanager
+    def pause(self):
+        """Drops observations meanwhile, e.g. while the master warms caches before forking."""
+        self.paused = True
+        try:
+            yield
+        finally:
+            self.paused = False
+
+    def observe_request(self, route, method, status, seconds, size=None):
+        if self.paused:
+            return
+        self._start_flusher()
+        key = (route, method)
+        with self.lock:
+            self.dirty = True
+            self.requests[(route, method, status)] += 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.sizes[key] = Histogram(SIZE_BUCKETS)
+            self.latency[key].observe(seconds)
+            if size is not None:
+                self.sizes[key].observe(size)
+
+    def observe_stage(self, name, seconds):
+        if self.paused:
+            return
+        self._start_flusher()
+        with self.lock:
+            self.dirty = True
+            hist = self.stages.get(name)
+            if hist is None:
+                hist = self.stages[name] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Times an internal step, e.g. `with metrics.stage("svg_render"): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """This process's numbers as JSON-friendly lists."""
+        with self.lock:
+            self.dirty = False
+            return {
+                "requests": [[*key, n] for key, n in self.requests.items()],
+                "latency": [[*key, h.counts, h.sum, h.count] for key, h in self.latency.items()],
+                "sizes": [[*key, h.counts, h.sum, h.count] for key, h in self.sizes.items()],
+                "stages": [[name, h.counts, h.sum, h.count] for name, h in self.stages.items()],
+            }
+
+    def flush(self):
+        """Writes this process's snapshot to the directory (atomically)."""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self.file is None or self.file[0] != os.getpid():
+            self.file = (os.getpid(), f"{os.getpid()}-{time.time_ns()}.json")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, os.path.join(self.directory, self.file[1]))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _start_flusher(self):
+        # Started lazily in the process that records, so a fork gets its own
+        if not self.directory or self.flusher_pid == os.getpid():
+            return
+        self.flusher_pid = os.getpid()
+
+        def loop():
+            while True:
+                time.sleep(self.FLUSH_SECONDS)
+                if self.dirty:
+                    try:
+                        self.flush()
+                    except OSError:
+                        pass # Directory gone or full; retried on the next tick
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+
+    def clear(self):
+        """Deletes every worker's file; call once when the server starts."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith((".json", ".part")):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def collect(self):
+        """(requests, latency, sizes, stages) summed over every worker's file, or just this process."""
+        if not self.directory:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush() # So this worker's latest numbers are included
+            snapshots = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue # Replaced or cleared meanwhile
+
+        requests, latency, sizes, stages = Counter(), {}, {}, {}
+        for snap in snapshots:
+            for route, method, status, n in snap["requests"]:
+                requests[(route, method, status)] += n
+            for table, rows, buckets in ((latency, snap["latency"], LATENCY_BUCKETS), (sizes, snap["sizes"], SIZE_BUCKETS)):
+                for route, method, counts, total, count in rows:
+                    table.setdefault((route, method), Histogram(buckets)).merge(counts, total, count)
+            for name, counts, total, count in snap["stages"]:
+                stages.setdefault(name, Histogram(LATENCY_BUCKETS)).merge(counts, total, count)
+        return requests, latency, sizes, stages
+
+    def render(self):
+        p = self.prefix
+        requests, latency, sizes, stages = self.collect()
+        lines = []
+        lines.append(f"# HELP {p}_requests_total HTTP requests by route, method and status.")
+        lines.append(f"# TYPE {p}_requests_total counter")
+        for (route, method, status), n in sorted(requests.items()):
+            lines.append(f"{p}_requests_total{_labels(route=route, method=method, status=status)} {n}")
+
+        lines.append(f"# HELP {p}_request_duration_seconds Time from request start to response (first byte for streams).")
+        lines.append(f"# TYPE {p}_request_duration_seconds histogram")
+        for (route, method), hist in sorted(latency.items()):
+            lines.extend(hist.render(f"{p}_request_duration_seconds", {"route": route, "method": method}))
+
+        lines.append(f"# HELP {p}_response_size_bytes Response body size (streamed bodies excluded).")
+        lines.append(f"# TYPE {p}_response_size_bytes histogram")
+        for (route, method), hist in sorted(sizes.items()):
+            lines.extend(hist.render(f"{p}_response_size_bytes", {"route": route, "method": method}))
+
+        lines.append(f"# HELP {p}_stage_duration_seconds Internal processing stages.")
+        lines.append(f"# TYPE {p}_stage_duration_seconds histogram")
+        for name, hist in sorted(stages.items()):
+            lines.extend(hist.render(f"{p}_stage_duration_seconds", {"stage": name}))
+        return "\n".join(lines) + "\n"
+
+    def init_app(self, app, path="/metrics"):
+        """Registers the timing hooks and the scrape endpoint on a Flask app."""
+        @app.before_request
+        def _start_timer():
+            g.metrics_start = time.perf_counter()
+
+        def route():
+            return request.url_rule.rule if request.url_rule else "unmatched"
+
+        @app.after_request
+        def _record(response):
+            start = g.pop("metrics_start", None)
+            if start is not None and request.path != path:
+                size = None if response.is_streamed else response.calculate_content_length()
+                self.observe_request(route(), request.method, response.status_code, time.perf_counter() - start, size)
+            return response
+
+        # after_request doesn't run when an exception escapes the view (e.g. with
+        # PROPAGATE_EXCEPTIONS); a timer still pending at teardown is such a 500
+        @app.teardown_request
+        def _record_error(exc):
+            start = g.pop("metrics_start", None)
+            if start is not None and request.path != path:
+                self.observe_request(route(), request.method, 500, time.perf_counter() - start)
+
+        @app.route(path)
+        def _metrics():
+            return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+metrics = Metrics(directory=os.environ.get("METRICS_DIR"))